@@ -0,0 +1,33 @@
+"""Benchmarks for the engine and renderer hot paths.
+
+Run ``python -m benchmarks`` from the repository root; see ``--help``.
+"""
+import os
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def measure(func, ops_per_call=1, min_time=0.25, min_runs=5):
+    """Call func repeatedly for at least min_time seconds.
+
+    ``ops_per_call`` is how many operations one call performs. Returns a
+    result dict with operations per second and milliseconds per operation.
+    """
+    func()  # Warm caches before timing
+    runs = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while runs < min_runs or elapsed < min_time:
+        func()
+        runs += 1
+        elapsed = time.perf_counter() - start
+    ops = runs * ops_per_call
+    return {
+        "ops": ops,
+        "ops_per_sec": ops / elapsed,
+        "ms_per_op": elapsed * 1000 / ops,
+    }
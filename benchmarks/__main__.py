@@ -0,0 +1,80 @@
+"""Run the benchmark suite, write JSON results and compare against a baseline"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+
+def run(selected):
+    from benchmarks import engine, render
+
+    results = {}
+    for name, bench in engine.BENCHMARKS.items():
+        if selected(name):
+            results[name] = bench()
+            report(name, results[name])
+
+    render_names = [name for name in render.BENCHMARKS if selected(name)]
+    if render_names:
+        scene = render.setup()
+        for name in render_names:
+            results[name] = render.BENCHMARKS[name](*scene)
+            report(name, results[name])
+    return results
+
+
+def report(name, result):
+    print(f"{name:32} {result['ops_per_sec']:>14,.0f} ops/s {result['ms_per_op']:>10.4f} ms/op")
+
+
+def compare(baseline, current, threshold):
+    """Names whose throughput dropped by more than threshold (a fraction)"""
+    regressions = []
+    for name, result in current.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        change = result["ops_per_sec"] / old["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10,
+                        help="allowed slowdown before flagging, as a fraction (default 0.10)")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks containing this text")
+    args = parser.parse_args(argv)
+
+    results = run(lambda name: args.filter in name)
+    if args.output:
+        import pygame
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "timestamp": time.time(),
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "platform": platform.platform(),
+                },
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for name, change in regressions:
+            print(f"REGRESSION {name}: {change:+.1%}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Engine benchmarks on fixed seeded boards; no display needed"""
+import random
+
+from board import Board
+from pieces import ROTATIONS, PIECE_COLORS, Block
+from simulation import Simulation
+from particles import ParticleSystem
+from bot import Bot
+
+from benchmarks import measure
+
+
+def seeded_board(seed=1234, filled_rows=10, density=0.6):
+    """Board whose bottom rows are randomly filled but never complete"""
+    rng = random.Random(seed)
+    board = Board()
+    for y in range(board.height - filled_rows, board.height):
+        for x in range(board.width):
+            if rng.random() < density:
+                board.rows[y] |= 1 << x
+                board.colors[y][x] = rng.choice(PIECE_COLORS)
+        if board.rows[y] == board.full_mask:
+            board.rows[y] &= ~1
+            board.colors[y][0] = 0
+    board.rebuild_heights()
+    return board
+
+
+def bench_check_collision():
+    board = seeded_board()
+    probes = [
+        (geometry.row_masks, x, y)
+        for rotations in ROTATIONS.values()
+        for geometry in rotations
+        for x in range(-2, board.width)
+        for y in range(0, board.height, 2)
+    ]
+    collides = board.collides
+
+    def run():
+        for masks, x, y in probes:
+            collides(masks, x, y)
+
+    return measure(run, len(probes))
+
+
+def bench_clear_lines():
+    sim = Simulation(seed=1)
+    template = seeded_board()
+    rows = template.rows[:]
+    colors = [row[:] for row in template.colors]
+    for y in (19, 17, 15, 14):
+        rows[y] = template.full_mask
+        colors[y] = [PIECE_COLORS[0]] * template.width
+    template.rows = rows
+    template.rebuild_heights()
+    heights = template.heights
+
+    def run():
+        sim.board.rows = rows[:]
+        sim.board.colors = [row[:] for row in colors]
+        sim.board.heights = heights[:]
+        sim.clear_lines()
+        sim.events.clear()
+
+    return measure(run)
+
+
+def bench_get_rotated_shape():
+    blocks = []
+    for name in ROTATIONS:
+        for rotation in range(4):
+            block = Block(name, PIECE_COLORS[0])
+            block.rotation = rotation
+            blocks.append(block)
+
+    def run():
+        for block in blocks:
+            block.get_rotated_shape()
+
+    return measure(run, len(blocks))
+
+
+def bench_particle_update():
+    particles = ParticleSystem()
+    particles.rng = __import__("numpy").random.default_rng(1)
+
+    def run():
+        if len(particles) < 600:
+            for x in range(40):
+                particles.emit(x * 7.5, 300, PIECE_COLORS[x % len(PIECE_COLORS)], 15)
+        particles.update()
+
+    return measure(run)
+
+
+def bench_simulation_frames():
+    sim = Simulation(seed=7, policy="bag")
+    actions = ["left", "right", "rotate", "down"]
+    rng = random.Random(7)
+
+    def run():
+        for _ in range(1000):
+            sim.apply(rng.choice(actions))
+            sim.step()
+            sim.events.clear()
+            if sim.topped_out:
+                sim.reset(7)
+
+    return measure(run, 1000)
+
+
+def bench_bot_choose():
+    sim = Simulation(seed=3, policy="bag")
+    sim.board = seeded_board(filled_rows=6)
+
+    def run():
+        Bot().choose(sim)  # Fresh bot so the transposition cache starts cold
+
+    return measure(run)
+
+
+BENCHMARKS = {
+    "engine.check_collision": bench_check_collision,
+    "engine.clear_lines": bench_clear_lines,
+    "engine.get_rotated_shape": bench_get_rotated_shape,
+    "engine.particle_update": bench_particle_update,
+    "engine.simulation_frame": bench_simulation_frames,
+    "engine.bot_choose": bench_bot_choose,
+}
@@ -0,0 +1,67 @@
+"""Renderer benchmarks drawing to an offscreen Surface under SDL's dummy driver"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from game import Game
+from pieces import PIECE_COLORS
+from renderer import Renderer
+
+from benchmarks import measure
+from benchmarks.engine import seeded_board
+
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 700
+
+
+def setup():
+    """Initialize pygame headlessly and build a mid-game scene"""
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(SCREEN_WIDTH, SCREEN_HEIGHT)
+    game.sim.reset(11)
+    game.sim.board = seeded_board()
+    game.game_started = True
+    game.particles.rng = __import__("numpy").random.default_rng(1)
+    for x in range(40):
+        game.particles.emit(x * 7.5, 300, PIECE_COLORS[x % len(PIECE_COLORS)], 15)
+    renderer = Renderer(SCREEN_WIDTH, SCREEN_HEIGHT, game)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    return game, renderer, surface
+
+
+def bench_frame(game, renderer, surface):
+    return measure(lambda: renderer.draw_scene(surface))
+
+
+def bench_start_screen(game, renderer, surface):
+    def run():
+        game.game_started = False
+        renderer.draw_scene(surface)
+        game.game_started = True
+
+    return measure(run)
+
+
+def bench_draw_grid(game, renderer, surface):
+    return measure(lambda: game.draw_grid(surface))
+
+
+def bench_draw_particles(game, renderer, surface):
+    return measure(lambda: game.draw_particles(surface))
+
+
+def bench_stats_panel(game, renderer, surface):
+    return measure(lambda: renderer.draw_stats_panel(surface, game))
+
+
+BENCHMARKS = {
+    "render.frame": bench_frame,
+    "render.start_screen": bench_start_screen,
+    "render.draw_grid": bench_draw_grid,
+    "render.draw_particles": bench_draw_particles,
+    "render.stats_panel": bench_stats_panel,
+}
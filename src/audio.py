@@ -1,38 +1,194 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
 import pygame
 
+SAMPLE_RATE = 44100
+BUFFER_SIZE = 512  # Small mixer buffer keeps the delay from play() to sound low
+
+SOUND_FILES = {
+    'line_clear': 'line_clear.wav',
+    'block_drop': 'block_drop.wav',
+    'game_over': 'game_over.wav',
+    'level_up': 'level_up.wav'
+}
+
+# Generated sample arrays by (name, mixer format), shared by every AudioManager
+_SAMPLE_CACHE = {}
+
+# Higher priority sounds may take a channel from lower priority ones when all are busy
+PRIORITY = {'block_drop': 0, 'line_clear': 1, 'level_up': 2, 'game_over': 3}
+
+
+def _tone(freq, duration, rate, volume=0.5, decay=6.0, shape="square"):
+    t = np.arange(int(duration * rate)) / rate
+    if shape == "square":
+        wave = np.sign(np.sin(2 * np.pi * freq * t))
+    else:
+        wave = np.sin(2 * np.pi * freq * t)
+    envelope = np.exp(-decay * t)
+    # Short fade in and out so notes don't click
+    fade = min(len(t), int(0.004 * rate))
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade)
+        envelope[:fade] *= ramp
+        envelope[-fade:] *= ramp[::-1]
+    return wave * envelope * volume
+
+
+def _notes(freqs, note_length, rate, **kwargs):
+    return np.concatenate([_tone(f, note_length, rate, **kwargs) for f in freqs])
+
+
+def synthesize(name, rate=SAMPLE_RATE):
+    """Float samples in [-1, 1] for one of the built-in effects"""
+    if name == 'line_clear':
+        return _notes((523, 659, 784, 1047), 0.06, rate, volume=0.35, decay=10)
+    if name == 'block_drop':
+        t = np.arange(int(0.08 * rate)) / rate
+        thump = np.sin(2 * np.pi * (110 - 500 * t) * t) * np.exp(-40 * t)
+        noise = np.random.default_rng(0).uniform(-1, 1, len(t)) * np.exp(-80 * t)
+        return thump * 0.6 + noise * 0.15
+    if name == 'level_up':
+        return _notes((392, 523, 659, 784, 1047), 0.08, rate, volume=0.35, decay=4, shape="sine")
+    if name == 'game_over':
+        return _notes((392, 330, 262, 196), 0.22, rate, volume=0.4, decay=3)
+    raise ValueError(f"Unknown sound: {name!r}")
+
+
+def to_mixer_format(samples, mixer_init):
+    """Convert float samples to an int array shaped for the mixer's format"""
+    _, size, channels = mixer_init
+    bits = abs(size)
+    peak = 2 ** (bits - 1) - 1
+    dtype = {8: np.int8, 16: np.int16, 32: np.int32}.get(bits, np.int16)
+    data = (np.clip(samples, -1.0, 1.0) * peak).astype(dtype)
+    if size > 0:
+        data = (data.astype(np.int64) + peak + 1).astype({8: np.uint8, 16: np.uint16}.get(bits, np.uint16))
+    if channels > 1:
+        data = np.repeat(data[:, None], channels, axis=1)
+    return np.ascontiguousarray(data)
+
+
 class AudioManager:
-    def __init__(self):
+    """Sound effects: procedural defaults, optional WAV overrides, a channel pool.
+
+    Every effect is synthesized once into a ready-to-play Sound, so the
+    game has audio even though no sound files ship with it. ``load`` does
+    that and then decodes any files under ``assets/sounds`` in the
+    background (on a thread on desktop, between frames on pygbag),
+    replacing the generated sound. Effects play on a fixed pool of
+    channels; when every channel is busy, a new sound takes over the
+    channel playing the lowest priority sound that isn't more important.
+    """
+
+    def __init__(self, channels=8, sound_dir='assets/sounds'):
+        self.sounds = {}
+        self.music_volume = 0.7
+        self.sfx_volume = 0.8
+        self.sound_dir = sound_dir
+        self.num_channels = channels
+        self.channels = []
+        self.playing = []  # Effect name last started on each channel
+        self.loaded = False
+        self.enabled = False  # Until init_mixer; sounds played before then are dropped
+
+    def init_mixer(self):
+        """Open the mixer and the channel pool; deferred so it doesn't hold up the first frame"""
+        if self.channels:
+            return
         try:
-            pygame.mixer.init()
-            self.sounds = {}
-            self.music_volume = 0.7
-            self.sfx_volume = 0.8
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(SAMPLE_RATE, -16, 2, BUFFER_SIZE)
+            pygame.mixer.set_num_channels(self.num_channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+            self.playing = [None] * self.num_channels
             self.enabled = True
-        except:
+        except pygame.error:
             self.enabled = False
-        
-    def load_sounds(self):
+
+    def generate_sound(self, name):
+        """Synthesize one built-in effect into a pre-decoded Sound"""
+        mixer_init = pygame.mixer.get_init()
+        samples = _SAMPLE_CACHE.get((name, mixer_init))
+        if samples is None:
+            samples = to_mixer_format(synthesize(name, mixer_init[0]), mixer_init)
+            _SAMPLE_CACHE[name, mixer_init] = samples
+        self.add_sound(name, pygame.sndarray.make_sound(samples))
+
+    def generate_sounds(self):
+        """Synthesize every built-in effect that isn't loaded yet"""
+        for name in SOUND_FILES:
+            if name not in self.sounds:
+                self.generate_sound(name)
+
+    def add_sound(self, name, sound):
+        sound.set_volume(self.sfx_volume)
+        self.sounds[name] = sound
+
+    async def load(self):
+        """Open the mixer, generate the built-in effects, then decode any sound files.
+
+        Each effect is generated on its own frame, so this can run as a
+        task while the start screen is up without stalling it.
+        """
+        if self.loaded:
+            return
+        self.init_mixer()
         if not self.enabled:
             return
-            
-        # For web deployment, sounds are optional
-        sound_files = {
-            'line_clear': 'line_clear.wav',
-            'block_drop': 'block_drop.wav', 
-            'game_over': 'game_over.wav',
-            'level_up': 'level_up.wav'
-        }
-        
-        for name, file in sound_files.items():
+        for name in SOUND_FILES:
+            await asyncio.sleep(0)
+            if name not in self.sounds:
+                self.generate_sound(name)
+        for name, file in SOUND_FILES.items():
+            path = os.path.join(self.sound_dir, file)
+            if not os.path.exists(path):
+                continue
             try:
-                self.sounds[name] = pygame.mixer.Sound(f'assets/sounds/{file}')
-                self.sounds[name].set_volume(self.sfx_volume)
-            except:
-                pass  # Sound file not found - game works without audio
-    
+                if sys.platform == "emscripten":
+                    await asyncio.sleep(0)  # No threads in the browser; load one file per frame
+                    sound = pygame.mixer.Sound(path)
+                else:
+                    sound = await asyncio.to_thread(pygame.mixer.Sound, path)
+            except pygame.error:
+                continue  # Unreadable file: keep the generated sound
+            self.add_sound(name, sound)
+        self.loaded = True
+
+    def load_sounds(self):
+        """Synchronous load, kept for callers that can block"""
+        self.init_mixer()
+        if self.enabled:
+            self.generate_sounds()
+            for name, file in SOUND_FILES.items():
+                try:
+                    self.add_sound(name, pygame.mixer.Sound(os.path.join(self.sound_dir, file)))
+                except (pygame.error, FileNotFoundError):
+                    pass  # Sound file not found - the generated sound stays
+            self.loaded = True
+
+    def pick_channel(self, priority):
+        """Index of a free channel, else the least important one this sound may take"""
+        victim = None
+        victim_priority = priority + 1
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            playing_priority = PRIORITY.get(self.playing[i], 0)
+            if playing_priority < victim_priority:
+                victim = i
+                victim_priority = playing_priority
+        return victim
+
     def play_sound(self, sound_name):
-        if self.enabled and sound_name in self.sounds:
-            try:
-                self.sounds[sound_name].play()
-            except:
-                pass  # Ignore audio errors in web environment
+        sound = self.sounds.get(sound_name)
+        if not self.enabled or sound is None:
+            return
+        index = self.pick_channel(PRIORITY.get(sound_name, 0))
+        if index is None:
+            return  # Everything playing is more important
+        self.channels[index].play(sound)
+        self.playing[index] = sound_name
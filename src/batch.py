@@ -0,0 +1,246 @@
+"""Vectorized environment stepping many boards in lockstep with NumPy.
+
+The rules mirror Simulation: the same spawn point, kicks, frame-based
+gravity, combo window, scoring and level curve. Boards are occupancy
+only (no colors) and every board has its own piece sequence.
+"""
+import numpy as np
+
+from pieces import SHAPES, ROTATIONS, KICKS, DEFAULT_KICKS
+from randomizer import BAG, PURE_RANDOM
+from simulation import FRAME_MS, COMBO_WINDOW_MS
+
+# Per-board actions for BatchGame.step
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+DOWN = 3
+ROTATE = 4
+
+PIECE_NAMES = list(SHAPES)
+
+
+def _build_tables():
+    cells = np.zeros((len(PIECE_NAMES), 4, 4, 2), dtype=np.int16)
+    max_kicks = max(len(kicks) for kicks in KICKS.values())
+    kicks = np.zeros((len(PIECE_NAMES), max_kicks, 2), dtype=np.int16)
+    for kind, name in enumerate(PIECE_NAMES):
+        for rotation, geometry in enumerate(ROTATIONS[name]):
+            cells[kind, rotation] = geometry.cells
+        piece_kicks = KICKS.get(name, DEFAULT_KICKS)
+        # Pad with repeats of the first kick; retrying it is harmless
+        padded = list(piece_kicks) + [piece_kicks[0]] * (max_kicks - len(piece_kicks))
+        kicks[kind] = padded
+    return cells, kicks
+
+
+# CELLS[kind, rotation] -> (4, 2) cell offsets; KICK_TABLE[kind] -> (k, 2)
+CELLS, KICK_TABLE = _build_tables()
+
+
+class BatchGame:
+    """N games stepped together; state lives in arrays indexed by board"""
+
+    def __init__(self, n, width=10, height=20, seed=None, policy=PURE_RANDOM, preview=4):
+        if policy not in (BAG, PURE_RANDOM):
+            raise ValueError(f"Unknown piece policy: {policy!r}")
+        self.n = n
+        self.width = width
+        self.height = height
+        self.policy = policy
+        self.preview_size = max(1, preview)
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.zeros((n, height, width), dtype=bool)
+        self.kind = np.zeros(n, dtype=np.int16)
+        self.rotation = np.zeros(n, dtype=np.int16)
+        self.x = np.zeros(n, dtype=np.int16)
+        self.y = np.zeros(n, dtype=np.int16)
+        self.preview = np.zeros((n, self.preview_size), dtype=np.int16)
+        self.bag = np.zeros((n, len(PIECE_NAMES)), dtype=np.int16)
+        self.bag_pos = np.full(n, len(PIECE_NAMES), dtype=np.int16)
+
+        self.frame = np.zeros(n, dtype=np.int64)
+        self.last_fall_frame = np.zeros(n, dtype=np.int64)
+        self.last_clear_time = np.zeros(n, dtype=np.float64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.combo = np.zeros(n, dtype=np.int64)
+        self.game_tick = np.full(n, 500, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        self.reset()
+
+    # Piece sequence
+
+    def _draw_pieces(self, idx):
+        """Draw one new piece kind for each board in idx"""
+        count = len(PIECE_NAMES)
+        if self.policy == PURE_RANDOM:
+            return self.rng.integers(0, count, size=len(idx), dtype=np.int16)
+        empty = idx[self.bag_pos[idx] >= count]
+        if empty.size:
+            self.bag[empty] = np.argsort(self.rng.random((empty.size, count)), axis=1)
+            self.bag_pos[empty] = 0
+        kinds = self.bag[idx, self.bag_pos[idx]]
+        self.bag_pos[idx] += 1
+        return kinds
+
+    def _spawn(self, idx):
+        """Move the head of the preview queue into play for boards in idx"""
+        if not idx.size:
+            return
+        self.kind[idx] = self.preview[idx, 0]
+        self.preview[idx, :-1] = self.preview[idx, 1:]
+        self.preview[idx, -1] = self._draw_pieces(idx)
+        self.rotation[idx] = 0
+        self.x[idx] = self.width // 2 - 1
+        self.y[idx] = 0
+        topped = self._collides(idx, self.kind[idx], self.rotation[idx], self.x[idx], self.y[idx])
+        self.done[idx[topped]] = True
+
+    def reset(self, mask=None):
+        """Reset every board, or only those where mask is True; returns the observation"""
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if idx.size:
+            self.boards[idx] = False
+            self.bag_pos[idx] = len(PIECE_NAMES)
+            for column in range(self.preview_size):
+                self.preview[idx, column] = self._draw_pieces(idx)
+            self.frame[idx] = 0
+            self.last_fall_frame[idx] = 0
+            self.last_clear_time[idx] = 0
+            self.score[idx] = 0
+            self.level[idx] = 1
+            self.lines[idx] = 0
+            self.combo[idx] = 0
+            self.game_tick[idx] = 500
+            self.done[idx] = False
+            self._spawn(idx)
+        return self.observe()
+
+    # Rules
+
+    def _collides(self, idx, kind, rotation, x, y):
+        cells = CELLS[kind, rotation]
+        cx = x[:, None] + cells[..., 0]
+        cy = y[:, None] + cells[..., 1]
+        inside = (cx >= 0) & (cx < self.width) & (cy >= 0) & (cy < self.height)
+        occupied = self.boards[
+            idx[:, None],
+            np.clip(cy, 0, self.height - 1),
+            np.clip(cx, 0, self.width - 1),
+        ]
+        return (~inside | occupied).any(axis=1)
+
+    def _shift(self, idx, dx, dy):
+        """Move boards in idx by (dx, dy) where it fits; returns the mask that moved"""
+        x = self.x[idx] + dx
+        y = self.y[idx] + dy
+        fits = ~self._collides(idx, self.kind[idx], self.rotation[idx], x, y)
+        moved = idx[fits]
+        self.x[moved] = x[fits]
+        self.y[moved] = y[fits]
+        return fits
+
+    def _rotate(self, idx):
+        kind = self.kind[idx]
+        rotation = (self.rotation[idx] + 1) % 4
+        pending = np.ones(idx.size, dtype=bool)
+        for k in range(KICK_TABLE.shape[1]):
+            if not pending.any():
+                break
+            sub = np.flatnonzero(pending)
+            kick = KICK_TABLE[kind[sub], k]
+            x = self.x[idx[sub]] + kick[:, 0]
+            y = self.y[idx[sub]] + kick[:, 1]
+            fits = ~self._collides(idx[sub], kind[sub], rotation[sub], x, y)
+            placed = sub[fits]
+            self.x[idx[placed]] = x[fits]
+            self.y[idx[placed]] = y[fits]
+            self.rotation[idx[placed]] = rotation[placed]
+            pending[placed] = False
+
+    def _lock_and_clear(self, idx):
+        cells = CELLS[self.kind[idx], self.rotation[idx]]
+        cx = self.x[idx][:, None] + cells[..., 0]
+        cy = self.y[idx][:, None] + cells[..., 1]
+        self.boards[idx[:, None], cy, cx] = True
+
+        full = self.boards[idx].all(axis=2)
+        lines = full.sum(axis=1)
+        cleared = lines > 0
+        if cleared.any():
+            c_idx = idx[cleared]
+            c_full = full[cleared]
+            c_lines = lines[cleared]
+
+            # Combo system
+            now = self.frame[c_idx] * FRAME_MS
+            in_window = now - self.last_clear_time[c_idx] < COMBO_WINDOW_MS
+            self.combo[c_idx] = np.where(in_window, self.combo[c_idx] + 1, 1)
+            self.last_clear_time[c_idx] = now
+
+            # Scoring and level progression, as in simulation.clear_score
+            self.score[c_idx] += c_lines * 100 * self.level[c_idx] + self.combo[c_idx] * 50
+            self.lines[c_idx] += c_lines
+            new_level = self.lines[c_idx] // 10 + 1
+            up = new_level > self.level[c_idx]
+            self.level[c_idx] = np.maximum(self.level[c_idx], new_level)
+            self.game_tick[c_idx[up]] = np.maximum(50, 500 - self.level[c_idx[up]] * 30)
+
+            # Stable sort puts full rows first, keeping the rest in order
+            order = np.argsort(~c_full, axis=1, kind="stable")
+            compacted = np.take_along_axis(self.boards[c_idx], order[:, :, None], axis=1)
+            compacted[np.arange(self.height)[None, :] < c_lines[:, None]] = False
+            self.boards[c_idx] = compacted
+
+        self._spawn(idx)
+        return lines
+
+    def _gravity(self, idx):
+        landed = ~self._shift(idx, 0, 1)
+        self._lock_and_clear(idx[landed])
+
+    def step(self, actions):
+        """Apply one action per board, advance a frame and run gravity.
+
+        Returns (reward, done) arrays; the reward is the score gained this
+        step. Finished boards ignore actions until reset.
+        """
+        actions = np.asarray(actions)
+        before = self.score.copy()
+        live = ~self.done
+
+        for action, (dx, dy) in ((LEFT, (-1, 0)), (RIGHT, (1, 0)), (DOWN, (0, 1))):
+            idx = np.flatnonzero(live & (actions == action))
+            if idx.size:
+                self._shift(idx, dx, dy)
+        idx = np.flatnonzero(live & (actions == ROTATE))
+        if idx.size:
+            self._rotate(idx)
+
+        self.frame[live] += 1
+        # Same float arithmetic as Simulation.update with its frame clock
+        elapsed = self.frame * FRAME_MS - self.last_fall_frame * FRAME_MS
+        idx = np.flatnonzero(live & (elapsed > self.game_tick))
+        if idx.size:
+            self._gravity(idx)
+            self.last_fall_frame[idx] = self.frame[idx]
+
+        return self.score - before, self.done.copy()
+
+    def observe(self):
+        """Current state as a dict of array copies (boards exclude the falling piece)"""
+        return {
+            "boards": self.boards.copy(),
+            "piece": self.kind.copy(),
+            "rotation": self.rotation.copy(),
+            "x": self.x.copy(),
+            "y": self.y.copy(),
+            "preview": self.preview.copy(),
+            "score": self.score.copy(),
+            "level": self.level.copy(),
+            "lines": self.lines.copy(),
+            "done": self.done.copy(),
+        }
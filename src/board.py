@@ -0,0 +1,136 @@
+class Board:
+    """Bitboard playfield: one int mask per row plus a color plane for drawing.
+
+    Bit ``x`` of ``rows[y]`` is set when cell (x, y) is occupied. ``colors``
+    mirrors the old list-of-lists grid (0 for empty, an RGB tuple otherwise)
+    and is only read by the renderer. ``heights[x]`` is the height of the
+    stack in column x (0 when empty), kept up to date by ``place`` and
+    ``clear_rows`` so drop distances don't need collision probes.
+    """
+
+    def __init__(self, width=10, height=20):
+        self.width = width
+        self.height = height
+        self.full_mask = (1 << width) - 1
+        self.reset()
+
+    def reset(self):
+        self.rows = [0] * self.height
+        self.colors = [[0] * self.width for _ in range(self.height)]
+        self.heights = [0] * self.width
+
+    def collides(self, row_masks, x, y):
+        """Check a piece given as (dy, mask) pairs placed at column x, row y"""
+        return rows_collide(self.rows, self.full_mask, row_masks, x, y)
+
+    def place(self, row_masks, x, y, color):
+        """Write a piece into the board without checking for collisions"""
+        rows = self.rows
+        colors = self.colors
+        heights = self.heights
+        for dy, mask in row_masks:
+            row = y + dy
+            height = self.height - row
+            shifted = mask << x if x >= 0 else mask >> -x
+            rows[row] |= shifted
+            color_row = colors[row]
+            while shifted:
+                low = shifted & -shifted
+                column = low.bit_length() - 1
+                color_row[column] = color
+                if heights[column] < height:
+                    heights[column] = height
+                shifted ^= low
+
+    def full_rows(self):
+        """Indices of completely filled rows, top to bottom"""
+        full_mask = self.full_mask
+        return [y for y, row in enumerate(self.rows) if row == full_mask]
+
+    def clear_rows(self, full_rows):
+        """Remove the given rows and drop everything above them"""
+        if not full_rows:
+            return
+        cleared = set(full_rows)
+        count = len(cleared)
+        self.rows = [0] * count + [row for y, row in enumerate(self.rows) if y not in cleared]
+        self.colors = [[0] * self.width for _ in range(count)] + [
+            row for y, row in enumerate(self.colors) if y not in cleared
+        ]
+        # A column's top cell drops by the number of cleared rows below it.
+        # Only columns whose top cell was itself cleared (rows cleared by a
+        # power-up aren't full) need to look further down for the new top.
+        heights = self.heights
+        for x, height in enumerate(heights):
+            if not height:
+                continue
+            top = self.height - height + sum(1 for y in cleared if y > self.height - height)
+            if self.height - height in cleared:
+                bit = 1 << x
+                top = next((y for y in range(top, self.height) if self.rows[y] & bit), self.height)
+            heights[x] = self.height - top
+
+    def rebuild_heights(self):
+        """Recompute ``heights`` from ``rows``; call after writing rows directly"""
+        heights = [0] * self.width
+        seen = 0
+        for y, row in enumerate(self.rows):
+            new = row & ~seen
+            while new:
+                low = new & -new
+                heights[low.bit_length() - 1] = self.height - y
+                new ^= low
+            seen |= row
+            if seen == self.full_mask:
+                break
+        self.heights = heights
+
+    def drop_distance(self, bottoms, x, y):
+        """Rows a piece can fall, from its lowest cell per column (see PieceGeometry.bottoms).
+
+        Returns None when part of the piece is below its column's surface,
+        e.g. tucked under an overhang, where the heights say nothing.
+        """
+        heights = self.heights
+        floor = self.height - 1
+        distance = self.height
+        for dx, dy in bottoms:
+            gap = floor - heights[x + dx] - (y + dy)
+            if gap < 0:
+                return None
+            if gap < distance:
+                distance = gap
+        return distance
+
+
+def rows_collide(rows, full_mask, row_masks, x, y):
+    """Collision test against any sequence of row masks, e.g. a bot's search state"""
+    height = len(rows)
+    for dy, mask in row_masks:
+        if x >= 0:
+            shifted = mask << x
+        else:
+            if mask & ((1 << -x) - 1):
+                return True  # Off the left wall
+            shifted = mask >> -x
+        if shifted & ~full_mask:
+            return True  # Off the right wall
+        row = y + dy
+        if row < 0 or row >= height:
+            return True
+        if rows[row] & shifted:
+            return True
+    return False
+
+
+def shape_row_masks(shape):
+    """Convert a 0/1 shape matrix into (dy, mask) pairs for its non-empty rows"""
+    masks = []
+    for dy, row in enumerate(shape):
+        mask = 0
+        for dx, cell in enumerate(row):
+            if cell:
+                mask |= 1 << dx
+        if mask:
+            masks.append((dy, mask))
+    return tuple(masks)
@@ -0,0 +1,269 @@
+"""Autoplayer: placement enumeration and beam search over the bitboard.
+
+Run ``python src/bot.py --games 20 --workers 4`` for a headless tournament.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import rows_collide
+from pieces import ROTATIONS
+from simulation import Simulation, MOVE_LEFT, MOVE_RIGHT, ROTATE, HARD_DROP
+
+# Ticks a headless player waits after each input, a key press every 50 ms
+TICKS_PER_ACTION = 3
+# Ticks spent looking at each new block before the first input, half a second
+THINK_TICKS = 30
+# Times the bot re-plans a block whose inputs didn't go as planned
+MAX_REPLANS = 3
+
+# Linear heuristic weights; positive is good
+DEFAULT_WEIGHTS = {
+    "lines": 0.76,
+    "height": -0.51,
+    "holes": -0.36,
+    "bumpiness": -0.18,
+}
+
+
+class Placement:
+    """Where a piece ends up: rotation, column and landing row"""
+
+    __slots__ = ("name", "rotation", "x", "y", "rows", "lines", "score")
+
+    def __init__(self, name, rotation, x, y, rows, lines, score=0.0):
+        self.name = name
+        self.rotation = rotation
+        self.x = x
+        self.y = y
+        self.rows = rows
+        self.lines = lines
+        self.score = score
+
+    @property
+    def geometry(self):
+        return ROTATIONS[self.name][self.rotation]
+
+
+def place_rows(rows, full_mask, row_masks, x, y):
+    """Lock a piece into a rows tuple; returns (new rows, lines cleared)"""
+    new_rows = list(rows)
+    for dy, mask in row_masks:
+        new_rows[y + dy] |= mask << x if x >= 0 else mask >> -x
+    kept = [row for row in new_rows if row != full_mask]
+    lines = len(new_rows) - len(kept)
+    if lines:
+        kept = [0] * lines + kept
+    return tuple(kept), lines
+
+
+def enumerate_placements(rows, width, name, origin=None):
+    """Every placement reachable by rotating at origin, sliding sideways and dropping straight down.
+
+    ``origin`` is the block's (x, y), the spawn point when None. Wall kicks
+    aren't modelled, so rotations that only fit with a kick are left out.
+    """
+    full_mask = (1 << width) - 1
+    x0, y0 = origin or (width // 2 - 1, 0)
+    placements = []
+    seen = set()
+    for geometry in ROTATIONS[name]:
+        masks = geometry.row_masks
+        # Slide out from the origin both ways until a wall or the stack blocks the path
+        for x, step in ((x0, 1), (x0 - 1, -1)):
+            while not rows_collide(rows, full_mask, masks, x, y0):
+                y = y0
+                while not rows_collide(rows, full_mask, masks, x, y + 1):
+                    y += 1
+                new_rows, lines = place_rows(rows, full_mask, masks, x, y)
+                if new_rows not in seen:  # Else a symmetric rotation landing in the same cells
+                    seen.add(new_rows)
+                    placements.append(Placement(name, geometry.rotation, x, y, new_rows, lines))
+                x += step
+            if x == x0:
+                break  # Doesn't fit at the origin, so nothing else is reachable either
+    return placements
+
+
+def evaluate(rows, width, lines, weights):
+    """Score a board from its aggregate height, holes, bumpiness and cleared lines"""
+    height = len(rows)
+    heights = [0] * width
+    seen = 0
+    holes = 0
+    for y, row in enumerate(rows):
+        new = row & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = height - y
+            new ^= low
+        holes += (seen & ~row).bit_count()
+        seen |= row
+    bumpiness = sum(abs(heights[i] - heights[i + 1]) for i in range(width - 1))
+    return (weights["lines"] * lines
+            + weights["height"] * sum(heights)
+            + weights["holes"] * holes
+            + weights["bumpiness"] * bumpiness)
+
+
+class Bot:
+    """Beam search over upcoming pieces with a transposition cache.
+
+    ``depth`` is how many known pieces (current, next, preview...) the
+    search looks at and ``beam_width`` how many candidate boards survive
+    each level. Expanded positions are cached by (rows, piece, origin) so
+    repeated boards are only enumerated once.
+    """
+
+    def __init__(self, weights=None, depth=2, beam_width=8, cache_size=50000):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.depth = depth
+        self.beam_width = beam_width
+        self.cache_size = cache_size
+        self.cache = {}
+
+    def expand(self, rows, width, name, origin=None):
+        key = (rows, name, origin)
+        placements = self.cache.get(key)
+        if placements is None:
+            placements = enumerate_placements(rows, width, name, origin)
+            for placement in placements:
+                placement.score = evaluate(placement.rows, width, placement.lines, self.weights)
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[key] = placements
+        return placements
+
+    def best_placement(self, rows, width, pieces, origin=None):
+        """Best first placement for the piece names in pieces, or None if none fit.
+
+        ``origin`` is where the first piece is now; later pieces start at the spawn point.
+        """
+        rows = tuple(rows)
+        pieces = pieces[:self.depth]
+        # Beam entries: (score, first placement, placement being extended)
+        beam = [(p.score, p, p) for p in self.expand(rows, width, pieces[0], origin)]
+        for name in pieces[1:]:
+            beam.sort(key=lambda entry: entry[0], reverse=True)
+            next_beam = []
+            for _, first, placement in beam[:self.beam_width]:
+                line_bonus = self.weights["lines"] * placement.lines
+                for child in self.expand(placement.rows, width, name):
+                    next_beam.append((child.score + line_bonus, first, child))
+            if not next_beam:
+                break  # Topped out inside the lookahead; keep the previous level
+            beam = next_beam
+        if not beam:
+            return None
+        return max(beam, key=lambda entry: entry[0])[1]
+
+    def choose(self, sim):
+        """Best placement for the Simulation's current block using its preview queue"""
+        block = sim.current_block
+        pieces = [block.name]
+        for i in range(min(self.depth - 1, len(sim.generator))):
+            pieces.append(sim.generator.peek(i)[0])
+        return self.best_placement(sim.board.rows, sim.width, pieces, (block.x, block.y))
+
+
+def play_placement(sim, placement, ticks_per_action=TICKS_PER_ACTION):
+    """Drive the simulation toward placement with legal inputs, stepping time between them.
+
+    Returns True once the block is hard-dropped at the placement's rotation
+    and column. Returns False as soon as an input is refused or gravity
+    locks the block on the way, so the caller can re-plan from wherever
+    the block ended up.
+    """
+    block = sim.current_block
+
+    def act(action):
+        changed = sim.apply(action)
+        for _ in range(ticks_per_action):
+            if sim.topped_out:
+                break
+            sim.step()
+        sim.events.clear()
+        return changed and sim.current_block is block
+
+    while block.rotation != placement.rotation:
+        if not act(ROTATE):
+            return False
+    while block.x != placement.x:
+        if not act(MOVE_RIGHT if block.x < placement.x else MOVE_LEFT):
+            return False
+    act(HARD_DROP)
+    return True
+
+
+def play_game(seed, weights=None, max_pieces=1000, depth=2, beam_width=8, policy="bag"):
+    """Play one headless game in simulated time; returns a result dict"""
+    sim = Simulation(seed=seed, policy=policy)
+    bot = Bot(weights, depth=depth, beam_width=beam_width)
+    pieces = 0
+    while not sim.topped_out and pieces < max_pieces:
+        # Human-like pacing, so gravity and the combo window behave as in real play
+        for _ in range(THINK_TICKS):
+            sim.step()
+        if sim.topped_out:
+            break
+        block = sim.current_block
+        for _ in range(MAX_REPLANS):
+            placement = bot.choose(sim)
+            if placement is None or play_placement(sim, placement):
+                break
+            if sim.current_block is not block:
+                break  # Gravity locked it first; move on to the next block
+        if sim.current_block is block and not sim.topped_out:
+            sim.apply(HARD_DROP)  # Out of plans; drop it where it is
+            sim.events.clear()
+        pieces += 1
+    return {
+        "seed": seed,
+        "score": sim.score,
+        "lines": sim.lines_cleared_total,
+        "level": sim.level,
+        "pieces": pieces,
+        "frames": sim.frame,
+        "topped_out": sim.topped_out,
+    }
+
+
+def _play_game_args(args):
+    return play_game(*args)
+
+
+def run_tournament(seeds, weights=None, max_pieces=1000, workers=None, depth=2, beam_width=8):
+    """Play one game per seed, fanned out over worker processes when workers > 1"""
+    jobs = [(seed, weights, max_pieces, depth, beam_width) for seed in seeds]
+    if workers == 1:
+        return [play_game(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_play_game_args, jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless bot tournament")
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--max-pieces", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--beam", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_tournament(range(args.seed, args.seed + args.games), None,
+                             args.max_pieces, args.workers, args.depth, args.beam)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        print(f"seed {result['seed']}: score {result['score']:,} lines {result['lines']} "
+              f"pieces {result['pieces']}{' (topped out)' if result['topped_out'] else ''}")
+    pieces = sum(result["pieces"] for result in results)
+    print(f"{len(results)} games, {pieces} pieces in {elapsed:.2f}s "
+          f"({pieces / elapsed:.0f} pieces/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
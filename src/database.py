@@ -1,48 +1,430 @@
+"""Score storage: SQLite on desktop, the JSON file as a fallback for the web build.
+
+Both stores keep every score (the JSON one up to ``max_entries``) and
+answer the same queries: a paged leaderboard, per-player bests and the
+rank a score would get. Entries are dicts with ``name``, ``score`` and
+``time`` keys, highest score first and older entries first on ties.
+"""
+import asyncio
+import bisect
+import http.client
 import json
+import math
 import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
-class DatabaseManager:
-    def __init__(self):
-        self.scores_file = "highscores.json"
-        
-    async def initialize(self):
-        """Initialize database connection"""
-        pass
-    
-    async def get_high_scores(self):
-        """Load high scores from JSON file"""
+LEGACY_JSON = "highscores.json"
+# Scores must fit SQLite's signed 64-bit integers
+MIN_SCORE = -2 ** 63
+MAX_SCORE = 2 ** 63 - 1
+
+
+def load_legacy_scores(path):
+    """Entries from a highscores.json file, old bare-number lists included"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, list):
+        return []
+    entries = []
+    for item in data:
         try:
-            if os.path.exists(self.scores_file):
-                with open(self.scores_file, 'r') as f:
-                    scores_data = json.load(f)
-                    # Handle both old format (just scores) and new format (with names)
-                    if scores_data and isinstance(scores_data[0], dict):
-                        return scores_data
-                    else:
-                        return [{"name": "Anonymous", "score": score} for score in scores_data]
-            return []
-        except:
-            return []
-    
-    async def save_score(self, player_name: str, score: int):
-        """Save a new score to JSON file"""
+            if isinstance(item, dict):
+                entry = {
+                    "name": str(item.get("name", "Anonymous")),
+                    "score": int(item.get("score", 0)),
+                    "time": float(item.get("time", 0)),
+                }
+            elif isinstance(item, (int, float)):
+                entry = {"name": "Anonymous", "score": int(item), "time": 0.0}
+            else:
+                continue
+        except (TypeError, ValueError, OverflowError):
+            continue  # One bad entry shouldn't stop the rest from migrating
+        if MIN_SCORE <= entry["score"] <= MAX_SCORE and math.isfinite(entry["time"]):
+            entries.append(entry)
+    return entries
+
+
+def make_entry(name, score, timestamp=None):
+    return {"name": name, "score": int(score), "time": time.time() if timestamp is None else timestamp}
+
+
+class ScoreStore:
+    """Interface shared by the score backends"""
+
+    def add(self, name, score, timestamp=None):
+        """Record a score; returns the stored entry"""
+        entry = make_entry(name, score, timestamp)
+        self.add_many([entry])
+        return entry
+
+    def add_many(self, entries):
+        """Record several entries in one write"""
+        raise NotImplementedError
+
+    def top(self, limit=5, offset=0):
+        """One page of the leaderboard"""
+        raise NotImplementedError
+
+    def best_per_player(self, limit=10, offset=0):
+        """Each player's best score, best first, as entries"""
+        raise NotImplementedError
+
+    def rank_of(self, score):
+        """1-based position a new score would take on the leaderboard"""
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteScoreStore(ScoreStore):
+    """Scores in a WAL-mode SQLite table indexed by score and by player.
+
+    On first open, entries from ``legacy_json`` are imported; the schema
+    version in ``PRAGMA user_version`` records that so it only happens once.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path="scores.db", legacy_json=LEGACY_JSON, check_same_thread=True):
+        import sqlite3
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; commits skip the fsync
+        self.migrate(legacy_json)
+
+    def migrate(self, legacy_json):
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " id INTEGER PRIMARY KEY,"
+                " name TEXT NOT NULL,"
+                " score INTEGER NOT NULL,"
+                " created REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, created)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS scores_by_player ON scores (name, score DESC)")
+            if legacy_json and os.path.exists(legacy_json):
+                self.db.executemany(
+                    "INSERT INTO scores (name, score, created) VALUES (?, ?, ?)",
+                    [(e["name"], e["score"], e["time"]) for e in load_legacy_scores(legacy_json)],
+                )
+            self.db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def add_many(self, entries):
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO scores (name, score, created) VALUES (?, ?, ?)",
+                [(e["name"], e["score"], e["time"]) for e in entries],
+            )
+
+    def _entries(self, query, params):
+        return [{"name": name, "score": score, "time": created}
+                for name, score, created in self.db.execute(query, params)]
+
+    def top(self, limit=5, offset=0):
+        return self._entries(
+            "SELECT name, score, created FROM scores ORDER BY score DESC, created LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+
+    def best_per_player(self, limit=10, offset=0):
+        return self._entries(
+            # With a lone MAX(), SQLite takes the bare created column from the best row
+            "SELECT name, MAX(score) AS best, created FROM scores"
+            " GROUP BY name ORDER BY best DESC LIMIT ? OFFSET ?",
+            (limit, offset),
+        )
+
+    def rank_of(self, score):
+        return self.db.execute("SELECT COUNT(*) FROM scores WHERE score >= ?", (score,)).fetchone()[0] + 1
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+class JSONScoreStore(ScoreStore):
+    """highscores.json kept sorted in memory and rewritten atomically on add.
+
+    Used where SQLite is unavailable (the pygbag build stores files in
+    browser storage). The file is read once; at most ``max_entries`` of
+    the best scores are kept so saves stay small.
+    """
+
+    def __init__(self, path=LEGACY_JSON, max_entries=500):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = sorted(load_legacy_scores(path), key=lambda e: (-e["score"], e["time"]))
+        self.keys = [(-e["score"], e["time"]) for e in self.entries]
+
+    def add_many(self, entries):
+        for entry in entries:
+            key = (-entry["score"], entry["time"])
+            index = bisect.bisect_right(self.keys, key)
+            self.keys.insert(index, key)
+            self.entries.insert(index, dict(entry))
+        del self.keys[self.max_entries:]
+        del self.entries[self.max_entries:]
+        self.save()
+
+    def save(self):
+        """Write to a temp file and rename it over the old one, so a crash never truncates scores"""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+
+    def top(self, limit=5, offset=0):
+        return [dict(e) for e in self.entries[offset:offset + limit]]
+
+    def best_per_player(self, limit=10, offset=0):
+        best = {}
+        for entry in self.entries:  # Sorted, so the first entry per name is its best
+            best.setdefault(entry["name"], entry)
+        return [dict(e) for e in list(best.values())[offset:offset + limit]]
+
+    def rank_of(self, score):
+        return bisect.bisect_right(self.keys, (-score, float("inf"))) + 1
+
+    def count(self):
+        return len(self.entries)
+
+
+def open_score_store(directory="."):
+    """SQLite store on desktop, JSON store on the web build or without sqlite3"""
+    legacy_json = os.path.join(directory, LEGACY_JSON)
+    if sys.platform != "emscripten":
         try:
-            scores = []
-            if os.path.exists(self.scores_file):
-                with open(self.scores_file, 'r') as f:
-                    existing_data = json.load(f)
-                    # Convert old format if needed
-                    if existing_data and isinstance(existing_data[0], dict):
-                        scores = existing_data
-                    else:
-                        scores = [{"name": "Anonymous", "score": s} for s in existing_data]
-            
-            scores.append({"name": player_name, "score": score})
-            scores.sort(key=lambda x: x["score"], reverse=True)
-            scores = scores[:5]  # Keep only top 5
-            
-            with open(self.scores_file, 'w') as f:
-                json.dump(scores, f)
-            return True
-        except:
-            return False
+            return SQLiteScoreStore(os.path.join(directory, "scores.db"), legacy_json)
+        except Exception:
+            pass  # No sqlite3 module, or the database can't be opened; fall back to JSON
+    return JSONScoreStore(legacy_json)
+
+
+class PersistenceWorker:
+    """Owns a ScoreStore and does all of its I/O off the game loop.
+
+    Scores are queued with ``submit`` and written by a background task;
+    everything waiting in the queue when the task wakes up goes out in a
+    single ``add_many``. On desktop the store is opened and used on one
+    dedicated thread (SQLite connections stay on the thread that made
+    them). Under pygbag there are no threads, so jobs run on the event
+    loop between frames; the JSON store writes to the in-memory
+    filesystem there and the browser syncs it to storage on its own.
+    Other file jobs, such as saving replays, can go through ``run_later``.
+    """
+
+    def __init__(self, store_factory=open_score_store, threaded=None):
+        if threaded is None:
+            threaded = sys.platform != "emscripten"
+        self.store_factory = store_factory
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="scores") if threaded else None
+        self.store = None
+        self.queue = asyncio.Queue()
+        self.task = None
+        self.errors = 0
+
+    async def call(self, func, *args):
+        """Run func(*args) on the store's thread, or inline when unthreaded"""
+        if self.executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def start(self):
+        self.store = await self.call(self.store_factory)
+        self.task = asyncio.create_task(self.run())
+
+    def submit(self, entry):
+        """Queue a score entry for writing; returns immediately"""
+        self.queue.put_nowait(("score", entry))
+
+    def run_later(self, func, *args):
+        """Queue any other blocking job to run in order with the score writes"""
+        self.queue.put_nowait(("job", func, args))
+
+    async def run(self):
+        while True:
+            items = [await self.queue.get()]
+            while not self.queue.empty():
+                items.append(self.queue.get_nowait())
+            scores = [item[1] for item in items if item[0] == "score"]
+            jobs = [item[1:] for item in items if item[0] == "job"]
+            batches = [(self.store.add_many, (scores,))] if scores else []
+            for func, args in batches + jobs:
+                try:
+                    await self.call(func, *args)
+                except Exception:
+                    self.errors += 1  # Storage errors must not take the game down
+            for _ in items:
+                self.queue.task_done()
+
+    async def close(self):
+        """Flush everything queued, then close the store"""
+        if self.task is not None:
+            await self.queue.join()
+            self.task.cancel()
+            self.task = None
+        if self.store is not None:
+            await self.call(self.store.close)
+            self.store = None
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+class LeaderboardClient:
+    """Syncs local scores with a leaderboard service (see leaderboard_server.py).
+
+    ``submit`` only appends to a pending list, which is saved to
+    ``pending_path`` so scores made offline survive a restart. A background
+    task uploads pending scores in batches over one keep-alive connection,
+    backing off exponentially (with jitter) while the service is
+    unreachable, and refreshes ``top`` with If-None-Match so an unchanged
+    board costs a 304. All network I/O runs on the client's own thread.
+    """
+
+    def __init__(self, url, pending_path="pending_scores.json", top_n=10,
+                 batch_size=50, interval=30.0, timeout=3.0, max_backoff=300.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.https = parsed.scheme == "https"
+        self.pending_path = pending_path
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.connection = None
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="leaderboard")
+        self.pending = load_pending(pending_path)
+        self.top = []
+        self.etag = None
+        self.online = False
+        self.failures = 0
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def submit(self, entry):
+        """Queue a score for upload; returns immediately"""
+        self.pending.append(dict(entry, id=uuid.uuid4().hex))
+        self.wakeup.set()
+
+    async def run(self):
+        while True:
+            try:
+                await self.call(self.sync_once)
+                self.online = True
+                self.failures = 0
+                delay = self.interval
+            except (OSError, http.client.HTTPException, ValueError):
+                self.online = False
+                self.failures += 1
+                self.close_connection()
+                delay = min(self.max_backoff, 2 ** self.failures) * random.uniform(0.5, 1.0)
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    # Everything below runs on the client's thread
+
+    def request(self, method, path, body=None, headers=None):
+        if self.connection is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self.connection = connection_class(self.host, self.port, timeout=self.timeout)
+        headers = dict(headers or {})
+        if body is not None:
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        data = response.read()  # Always drain, or the connection can't be reused
+        return response, data
+
+    def close_connection(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def sync_once(self):
+        """Upload pending scores in batches, then refresh the cached top scores"""
+        if self.pending:
+            save_pending(self.pending_path, list(self.pending))  # Survive a crash while offline
+        while self.pending:
+            batch = self.pending[:self.batch_size]
+            response, _ = self.request("POST", "/scores", {"scores": batch})
+            if response.status >= 500:
+                raise http.client.HTTPException(f"upload failed with {response.status}")
+            # A 4xx batch would never succeed, so it is dropped like a sent one.
+            # submit() may have appended meanwhile; only remove what was sent
+            del self.pending[:len(batch)]
+            save_pending(self.pending_path, list(self.pending))
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        response, data = self.request("GET", f"/scores?limit={self.top_n}", headers=headers)
+        if response.status == 200:
+            body = json.loads(data)
+            if not isinstance(body, dict) or not isinstance(body.get("scores"), list):
+                raise http.client.HTTPException("fetch returned no score list")
+            self.top = body["scores"]
+            self.etag = response.getheader("ETag")
+        elif response.status != 304:
+            raise http.client.HTTPException(f"fetch failed with {response.status}")
+
+    async def close(self):
+        """Stop syncing and keep whatever is still pending on disk"""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        await self.call(save_pending, self.pending_path, list(self.pending))
+        await self.call(self.close_connection)
+        self.executor.shutdown()
+
+
+def load_pending(path):
+    try:
+        with open(path) as f:
+            pending = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return pending if isinstance(pending, list) else []
+
+
+def save_pending(path, pending):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(pending, f)
+    os.replace(temp_path, path)
+
+
+def open_leaderboard_client(url=None):
+    """Client for url (default: $NEON_TETRIS_LEADERBOARD), or None when unset or on the web build"""
+    url = url or os.environ.get("NEON_TETRIS_LEADERBOARD")
+    if not url or sys.platform == "emscripten":
+        return None  # The browser build has no sockets to sync with
+    return LeaderboardClient(url)
@@ -0,0 +1,177 @@
+import pygame
+
+
+class DirtyRectTracker:
+    """Works out which screen regions changed since the last presented frame.
+
+    ``scan`` compares a small snapshot of the game against the previous one
+    and marks the regions whose content differs: changed board rows, the
+    active block's old and new footprint, panels whose values changed and
+    the particle bounding boxes. Menus are only marked after an input.
+    """
+
+    def __init__(self, width, height, game, layers):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.game = game
+        self.layers = layers
+        self.rects = []
+        self.input_seen = True
+        self.scene = None
+        self.rows = None
+        self.block_key = None
+        self.block_rect = None
+        self.next_key = None
+        self.stats_key = None
+        self.particle_rect = None
+        self.powerups_key = frozenset()
+        self.touch_key = None
+
+    def mark(self, rect):
+        if rect is not None:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.rects = [self.screen_rect.copy()]
+
+    def note_input(self):
+        """Called for every input event so static screens get one redraw"""
+        self.input_seen = True
+
+    def resize(self, width, height):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self.scene = None
+
+    def block_footprint(self, block, position=None):
+        cell_size = self.game.cell_size
+        geometry = block.geometry
+        left, top = position or (block.x * cell_size, block.y * cell_size)
+        return pygame.Rect(
+            left + geometry.min_x * cell_size,
+            top + geometry.min_y * cell_size,
+            geometry.width * cell_size,
+            geometry.height * cell_size,
+        )
+
+    def scan(self):
+        """Mark everything that changed since the previous scan"""
+        game = self.game
+        scene = (game.game_started, game.show_high_scores, game.show_name_input, game.game_over)
+        if scene != self.scene or (self.input_seen and scene[:3] != (True, False, False)):
+            # Screen switch, or input on a static menu
+            self.scene = scene
+            self.input_seen = False
+            self.rows = None
+            self.block_key = None
+            self.next_key = None
+            self.stats_key = None
+            self.particle_rect = None
+            self.powerups_key = frozenset()
+            self.touch_key = None
+            self.mark_all()
+            if scene[:3] != (True, False, False):
+                return
+        self.input_seen = False
+
+        # Board rows
+        board = game.board
+        cell_size = game.cell_size
+        rows = [(mask, tuple(colors)) for mask, colors in zip(board.rows, board.colors)]
+        if self.rows is not None:
+            for y, (old, new) in enumerate(zip(self.rows, rows)):
+                if old != new:
+                    self.mark((0, y * cell_size, game.grid_width * cell_size, cell_size))
+        self.rows = rows
+
+        # Active block, old and new footprint
+        block = game.current_block
+        if block is not None and not game.game_over:
+            position = game.block_position(block)  # Interpolated, so it can sit between cells
+            block_key = (id(block), block.name, block.color, block.rotation, position)
+            block_rect = self.block_footprint(block, position)
+        else:
+            block_key = None
+            block_rect = None
+        if block_key is not None and game.show_hint and game.hint is not None:
+            hint = game.hint
+            block_key += (hint.rotation, hint.x, hint.y)
+            block_rect = block_rect.union(self.block_footprint(hint))
+        if block_key is not None and game.ghost_visible:
+            landing_y = game.sim.landing_y(block)
+            block_key += ("ghost", block.x, landing_y)
+            block_rect = block_rect.union(self.block_footprint(block, (block.x * cell_size, landing_y * cell_size)))
+        if block_key != self.block_key:
+            self.mark(self.block_rect)
+            self.mark(block_rect)
+            self.block_key = block_key
+            self.block_rect = block_rect
+
+        # Power-ups, including their blink state
+        powerups_key = frozenset(
+            (p.x, p.y, p.type) for p in game.sim.powerups if game.powerup_visible(p)
+        )
+        if powerups_key != self.powerups_key:
+            for x, y, _ in powerups_key ^ self.powerups_key:
+                self.mark((x * cell_size, y * cell_size, cell_size, cell_size))
+            self.powerups_key = powerups_key
+
+        # Touch buttons light up while held
+        touch = game.touch_controls
+        if touch is not None and touch.held != self.touch_key:
+            self.touch_key = touch.held
+            self.mark(touch.rect)
+
+        # Panels whose values changed
+        next_block = game.next_block
+        next_key = (id(next_block), next_block.name, next_block.color) if next_block else None
+        if next_key != self.next_key:
+            self.next_key = next_key
+            self.mark(self.layers.next_panel_rect.inflate(6, 6))
+        stats_key = (
+            game.score,
+            game.level,
+            game.game_over,
+            None if game.game_over else game.elapsed_ms() // 1000,
+            game.high_score_manager.leaderboard.best,
+        )
+        if stats_key != self.stats_key:
+            self.stats_key = stats_key
+            self.mark(self.layers.stats_panel_rect.inflate(6, 6))
+
+        # Particles, previous and current extent
+        particle_rect = game.particles.bounds()
+        if particle_rect is not None or self.particle_rect is not None:
+            self.mark(self.particle_rect)
+            self.mark(particle_rect)
+        self.particle_rect = particle_rect
+
+    def regions(self, max_regions=4):
+        """Marked rects clipped to the screen, with overlapping ones merged.
+
+        Each region is redrawn under its own clip, so far-apart changes
+        don't pull the space between them into the redraw. Past
+        ``max_regions`` the per-region scene draws cost more than they
+        save, and everything is merged into one rect.
+        """
+        merged = []
+        for rect in self.rects:
+            rect = rect.clip(self.screen_rect)
+            if not (rect.width and rect.height):
+                continue
+            # A union can reach rects it didn't overlap before, so repeat until it settles
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        if len(merged) > max_regions:
+            merged = [merged[0].unionall(merged[1:])]
+        self.rects = merged
+        return merged
+
+    def flush(self):
+        """Present the marked regions and start a new frame"""
+        rects = self.regions()
+        if rects:
+            pygame.display.update(rects)
+        self.rects = []
+        return rects
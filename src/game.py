@@ -1,104 +1,35 @@
-import pygame
-import random
-import json
-import os
 import asyncio
-
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity_x = random.uniform(-3, 3)
-        self.velocity_y = random.uniform(-5, -1)
-        self.lifetime = 60
-        self.max_lifetime = 60
-        
-    def update(self):
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.velocity_y += 0.1  # Gravity
-        self.lifetime -= 1
-        
-    def draw(self, screen):
-        if self.lifetime > 0:
-            alpha = self.lifetime / self.max_lifetime
-            size = int(4 * alpha)
-            if size > 0:
-                pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
-
-# Enhanced color palette with neon/glow effects
-COLORS = {
-    "black": (0, 0, 0),
-    "white": (255, 255, 255),
-    "red": (255, 50, 50),
-    "green": (50, 255, 50),
-    "blue": (50, 50, 255),
-    "cyan": (50, 255, 255),
-    "magenta": (255, 50, 255),
-    "yellow": (255, 255, 50),
-    "orange": (255, 165, 50),
-    "purple": (200, 50, 255),
-    "lime": (150, 255, 50),
-    "pink": (255, 100, 150),
-}
-
-# Block shapes and their rotations
-SHAPES = {
-    "I": [
-        [0, 0, 0, 0],
-        [1, 1, 1, 1],
-        [0, 0, 0, 0],
-        [0, 0, 0, 0],
-    ],
-    "J": [
-        [1, 0, 0],
-        [1, 1, 1],
-        [0, 0, 0],
-    ],
-    "L": [
-        [0, 0, 1],
-        [1, 1, 1],
-        [0, 0, 0],
-    ],
-    "O": [
-        [1, 1],
-        [1, 1],
-    ],
-    "S": [
-        [0, 1, 1],
-        [1, 1, 0],
-        [0, 0, 0],
-    ],
-    "T": [
-        [0, 1, 0],
-        [1, 1, 1],
-        [0, 0, 0],
-    ],
-    "Z": [
-        [1, 1, 0],
-        [0, 1, 1],
-        [0, 0, 0],
-    ],
+import sys
+import pygame
+from audio import AudioManager
+from particles import ParticleSystem
+from sprites import CellSpriteAtlas
+from pieces import COLORS, PIECE_COLORS
+from simulation import Simulation, FRAME_MS
+from input import InputController
+from mobile_controls import TouchControls
+from replay import ReplayRecorder, save_replay
+from leaderboard import Leaderboard
+from perf import instruments
+from startup import startup
+from timestep import FixedTimestep
+
+POWERUP_COLORS = {
+    "clear_line": COLORS["yellow"],
+    "slow_time": COLORS["cyan"],
+    "ghost_block": COLORS["purple"],
 }
 
-class Block:
-    def __init__(self, shape, color):
-        self.shape = shape
-        self.color = color
-        self.rotation = 0
-        self.x = 0
-        self.y = 0
-
-    def get_rotated_shape(self):
-        rotated = self.shape
-        for _ in range(self.rotation):
-            rotated = [list(row) for row in zip(*rotated[::-1])]
-        return rotated
 
 class HighScoreManager:
-    def __init__(self):
-        self.high_scores = []
+    """Top of the leaderboard for the UI; writes go through a PersistenceWorker"""
+
+    def __init__(self, worker=None, size=5):
+        self.worker = worker
+        self.size = size
+        self.leaderboard = Leaderboard(size)
+        self.client = None  # LeaderboardClient when an online leaderboard is configured
+        self.pending = []  # Scores added before the worker started
         self.player_name = "Anonymous"
         
     async def initialize(self):
@@ -106,114 +37,164 @@ class HighScoreManager:
         await self.load_scores()
     
     async def load_scores(self):
-        """Load high scores from local storage or file"""
+        """Start the persistence worker and load the top entries"""
+        # Storage and networking modules load here, after the first frame
+        from database import PersistenceWorker, open_leaderboard_client
+        if self.worker is None:
+            worker = PersistenceWorker()
+            await worker.start()
+            self.worker = worker
+        if self.client is None:
+            self.client = open_leaderboard_client()
+            if self.client is not None:
+                self.client.start()
         try:
-            # Try to load from local file for desktop
-            if os.path.exists("highscores.json"):
-                with open("highscores.json", 'r') as f:
-                    scores_data = json.load(f)
-                    if scores_data and isinstance(scores_data[0], dict):
-                        self.high_scores = scores_data
-                    else:
-                        self.high_scores = [{"name": "Anonymous", "score": score} for score in scores_data]
-            else:
-                self.high_scores = []
-        except:
-            self.high_scores = []
+            self.leaderboard.load(await self.worker.call(self.worker.store.top, self.size))
+        except Exception:
+            self.leaderboard.load([])
+        pending, self.pending = self.pending, []
+        for entry in pending:
+            self.save_entry(entry)
+
+    @property
+    def high_scores(self):
+        """Top entries, best first"""
+        return self.leaderboard.entries
     
-    async def add_score(self, score: int):
-        """Add a new score"""
-        try:
-            self.high_scores.append({"name": self.player_name, "score": score})
-            self.high_scores.sort(key=lambda x: x["score"], reverse=True)
-            self.high_scores = self.high_scores[:5]
-            
-            # Try to save to file for desktop
-            try:
-                with open("highscores.json", 'w') as f:
-                    json.dump(self.high_scores, f)
-            except:
-                pass  # Ignore file save errors in web environment
-            
-            return True
-        except:
-            return False
+    def add_score(self, score: int):
+        """Show the new score right away and queue it to be saved"""
+        from database import make_entry
+        entry = make_entry(self.player_name, score)
+        if self.worker is None:
+            self.leaderboard.insert(entry)
+            self.pending.append(entry)  # Saved once load_scores has started the worker
+        else:
+            self.save_entry(entry)
+        return entry
+
+    def save_entry(self, entry):
+        self.leaderboard.insert(entry)
+        self.worker.submit(entry)
+        if self.client is not None:
+            self.client.submit(entry)
+
+    async def close(self):
+        """Flush queued writes; called on exit"""
+        if self.client is not None:
+            await self.client.close()
+        if self.worker is not None:
+            await self.worker.close()
     
     def is_high_score(self, score):
         """Check if score qualifies for high score list"""
-        if len(self.high_scores) < 5:
-            return True
-        return score > min(s["score"] for s in self.high_scores) if self.high_scores else True
+        return self.leaderboard.qualifies(score)
+
+def _sim_property(name, doc):
+    """Read-only attribute forwarded to the game's Simulation"""
+    return property(lambda self: getattr(self.sim, name), doc=doc)
 
 class Game:
+    """Pygame renderer and input adapter over a headless Simulation"""
+
+    board = _sim_property("board", "Bitboard of locked cells")
+    current_block = _sim_property("current_block", "Falling block")
+    next_block = _sim_property("next_block", "Block shown in the preview")
+    generator = _sim_property("generator", "Seeded piece queue, peekable for the preview panel")
+    score = _sim_property("score", "Current score")
+    level = _sim_property("level", "Current level")
+    lines_cleared_total = _sim_property("lines_cleared_total", "Lines cleared this game")
+    combo_count = _sim_property("combo_count", "Consecutive clears inside the combo window")
+    game_tick = _sim_property("game_tick", "Milliseconds between gravity steps")
+    start_time = _sim_property("start_time", "Clock time the current game started")
+
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.grid_width = 10
         self.grid_height = 20
         self.cell_size = 30
-        self.grid = [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)]
-        self.current_block = None
-        self.next_block = None
-        self.particles = []
-        self.score = 0
+        self.sim = Simulation(self.grid_width, self.grid_height, powerups=True)
+        self.timestep = FixedTimestep()
+        self.prev_block = None  # (block, rotation, x, y) before the latest tick
+        self.recorder = None
+        self.last_replay = None
+        self.particles = ParticleSystem()
+        self.audio = AudioManager()
+        self.sprites = CellSpriteAtlas(PIECE_COLORS, (self.cell_size, 23, 14))
         self.game_over = False
         self.game_started = False
         self.show_high_scores = False
         self.show_name_input = False
         self.player_name = ""
-        self.game_tick = 500
-        self.last_fall_time = pygame.time.get_ticks()
-        self.start_time = pygame.time.get_ticks()
         self.high_score_manager = HighScoreManager()
-        self.combo_count = 0
-        self.last_clear_time = 0
         self.screen_shake = 0
-        self.level = 1
-        self.lines_cleared_total = 0
-        
-        # Initialize blocks
-        self.generate_next_block()
-        self.spawn_block()
+        self.show_hint = False
+        self.show_ghost = True
+        self.audio_task = None
+        self.scores_task = None
+        # On-screen buttons in the browser, where the player may have no keyboard
+        self.touch_controls = TouchControls(screen_width, screen_height) if sys.platform == "emscripten" else None
+        self.input = InputController(touch=self.touch_controls)
+        self.bot = None
+        self.hint = None
+        self.hint_block = None
+
+    @property
+    def grid(self):
+        """Color plane of the board, 0 for empty cells"""
+        return self.sim.board.colors
+
+    def elapsed_ms(self):
+        """Milliseconds since the current game started"""
+        return int(self.sim.elapsed_ms())
 
     def generate_next_block(self):
         """Generate a new random block"""
-        shape_name = random.choice(list(SHAPES.keys()))
-        color = random.choice(list(COLORS.values())[2:])  # Skip black and white
-        self.next_block = Block(SHAPES[shape_name], color)
+        self.sim.generate_next_block()
     
     def spawn_block(self):
         """Spawn the next block as current block"""
-        if self.next_block is None:
-            self.generate_next_block()
-        
-        self.current_block = self.next_block
-        self.current_block.x = self.grid_width // 2 - 1
-        self.current_block.y = 0
-        
-        # Generate new next block
-        self.generate_next_block()
-        
-        # Check for game over
-        if self.check_collision(self.current_block):
-            asyncio.create_task(self.handle_game_over())
+        self.sim.spawn_block()
     
     async def initialize(self):
-        """Initialize game with database"""
-        await self.high_score_manager.initialize()
+        """Start loading sounds and scores; both finish while the start screen is up"""
+        self.audio_task = asyncio.create_task(startup.track("audio", self.audio.load()))
+        self.scores_task = asyncio.create_task(startup.track("scores", self.high_score_manager.initialize()))
+
+    @property
+    def loading(self):
+        """Whether background loads started by initialize are still running"""
+        return any(task is not None and not task.done() for task in (self.audio_task, self.scores_task))
+
+    async def shutdown(self):
+        """Flush pending saves before exit"""
+        if self.scores_task is not None:
+            await asyncio.gather(self.scores_task, return_exceptions=True)
+        await self.high_score_manager.close()
     
     async def handle_game_over(self):
         """Handle game over with database save"""
+        if self.recorder is not None:
+            self.last_replay = self.recorder.finish(self.sim)
+            self.recorder = None
+            # Replays are optional; the worker swallows errors such as read-only storage
+            if self.high_score_manager.worker is not None:
+                self.high_score_manager.worker.run_later(save_replay, self.last_replay)
+            else:
+                try:
+                    save_replay(self.last_replay)
+                except OSError:
+                    pass
         if self.high_score_manager.is_high_score(self.score):
             self.show_name_input = True
         else:
             self.game_over = True
     
-    async def save_high_score(self):
-        """Save high score with player name"""
+    def save_high_score(self):
+        """Save high score with player name; the write happens in the background"""
         if self.player_name.strip():
             self.high_score_manager.player_name = self.player_name.strip()
-            await self.high_score_manager.add_score(self.score)
+            self.high_score_manager.add_score(self.score)
         self.show_name_input = False
         self.game_over = True
 
@@ -232,66 +213,185 @@ class Game:
         """Toggle high scores display"""
         self.show_high_scores = not self.show_high_scores
 
-    def draw_grid(self, screen):
-        """Draw the game grid"""
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
+    def toggle_hint(self):
+        """Toggle the bot's suggested placement for the current block"""
+        self.show_hint = not self.show_hint
+        if self.show_hint and self.bot is None:
+            from bot import Bot  # Only pay for the search code when hints are used
+            self.bot = Bot()
+
+    def update_hint(self):
+        """Recompute the hint once per spawned block"""
+        block = self.current_block
+        if not self.show_hint or block is None or block is self.hint_block:
+            return
+        self.hint_block = block
+        with instruments.timer("hint"):
+            self.hint = self.bot.choose(self.sim)
+
+    def draw_grid_lines(self, screen):
+        """Draw the empty grid cell outlines"""
+        for y in range(self.grid_height):
+            for x in range(self.grid_width):
                 rect = pygame.Rect(x * self.cell_size, y * self.cell_size, 
                                  self.cell_size, self.cell_size)
-                if cell != 0:
-                    pygame.draw.rect(screen, cell, rect)
-                    pygame.draw.rect(screen, (255, 255, 255), rect, 1)
-                else:
-                    pygame.draw.rect(screen, (40, 40, 60), rect, 1)
+                pygame.draw.rect(screen, (40, 40, 60), rect, 1)
+
+    def draw_grid(self, screen):
+        """Draw the locked cells of the game grid"""
+        cell_size = self.cell_size
+        get_sprite = self.sprites.get
+        rows = self.board.rows
+        screen.blits(
+            [
+                (get_sprite(cell, cell_size, False), (x * cell_size, y * cell_size))
+                for y, row in enumerate(self.grid) if rows[y]
+                for x, cell in enumerate(row) if cell != 0
+            ],
+            doreturn=False,
+        )
+
+    def draw_hint(self, screen):
+        """Outline where the bot would place the current block"""
+        if not self.show_hint or self.hint is None or self.hint_block is not self.current_block:
+            return
+        cell_size = self.cell_size
+        hint = self.hint
+        sprite = self.sprites.outline(self.current_block.color, cell_size, 2)
+        screen.blits(
+            [(sprite, ((hint.x + x) * cell_size, (hint.y + y) * cell_size)) for x, y in hint.geometry.cells],
+            doreturn=False,
+        )
+
+    def draw_powerups(self, screen):
+        """Draw power-ups waiting on the board; they blink during their last second"""
+        cell_size = self.cell_size
+        for power_up in self.sim.powerups:
+            if not self.powerup_visible(power_up):
+                continue
+            sprite = self.sprites.outline(COLORS["white"], cell_size, 2, 4, POWERUP_COLORS[power_up.type])
+            screen.blit(sprite, (power_up.x * cell_size, power_up.y * cell_size))
+
+    def powerup_visible(self, power_up):
+        frame = self.sim.frame
+        return power_up.expires - frame >= 60 or (frame // 8) % 2 == 0
+
+    @property
+    def ghost_visible(self):
+        """Ghost piece is on by setting, or forced on by the ghost_block power-up"""
+        return self.show_ghost or self.sim.ghost_effects > 0
+
+    def toggle_ghost(self):
+        self.show_ghost = not self.show_ghost
+
+    def draw_ghost(self, screen):
+        """Outline where the current block would land"""
+        block = self.current_block
+        if not self.ghost_visible or block is None:
+            return
+        cell_size = self.cell_size
+        y = self.sim.landing_y(block)
+        sprite = self.sprites.outline(COLORS["white"], cell_size, 1, 2)
+        screen.blits(
+            [(sprite, ((block.x + x) * cell_size, (y + dy) * cell_size)) for x, dy in block.geometry.cells],
+            doreturn=False,
+        )
 
     def draw_block(self, screen, block):
         """Draw block with enhanced graphics"""
-        shape = block.get_rotated_shape()
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    rect = pygame.Rect(
-                        (block.x + x) * self.cell_size, 
-                        (block.y + y) * self.cell_size, 
-                        self.cell_size, 
-                        self.cell_size
-                    )
-                    
-                    # Main block color
-                    pygame.draw.rect(screen, block.color, rect)
-                    
-                    # Inner highlight for 3D effect
-                    highlight_rect = pygame.Rect(rect.x + 2, rect.y + 2, rect.width - 4, rect.height - 4)
-                    highlight_color = tuple(min(255, c + 80) for c in block.color)
-                    pygame.draw.rect(screen, highlight_color, highlight_rect, 2)
-                    
-                    # Outer border
-                    pygame.draw.rect(screen, (255, 255, 255), rect, 1)
-
-    async def update(self):
+        cell_size = self.cell_size
+        sprite = self.sprites.get(block.color, cell_size)
+        left, top = self.block_position(block)
+        screen.blits(
+            [
+                (sprite, (left + x * cell_size, top + y * cell_size))
+                for x, y in block.geometry.cells
+            ],
+            doreturn=False,
+        )
+
+    async def update(self, dt_ms=FRAME_MS):
+        """Advance the game by dt_ms of real time in fixed simulation ticks"""
         if not self.game_started or self.game_over:
+            self.timestep.reset()
             return
 
-        # Update particles
-        self.particles = [p for p in self.particles if p.lifetime > 0]
-        for particle in self.particles:
-            particle.update()
-
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_fall_time > self.game_tick:
-            self.current_block.y += 1
-            if self.check_collision(self.current_block):
-                self.current_block.y -= 1
-                self.lock_block()
-                self.clear_lines()
-                self.spawn_block()
-            self.last_fall_time = current_time
-
-    async def handle_input(self, event):
+        ticks = self.timestep.advance(dt_ms)
+        instruments.count("ticks", ticks)
+        for _ in range(ticks):
+            for action in self.input.poll():
+                self.sim.apply(action)
+            # Interpolate gravity only; input shows up on the frame it's applied
+            block = self.current_block
+            self.prev_block = (block, block.rotation, block.x, block.y)
+
+            # Update particles
+            with instruments.timer("particles"):
+                self.particles.update()
+
+            with instruments.timer("sim"):
+                self.sim.step()
+            if self.process_sim_events():
+                await self.handle_game_over()
+                break
+        instruments.gauge("particles", len(self.particles))
+        self.update_hint()
+
+    def block_position(self, block):
+        """Pixel position to draw block at, interpolated between the last two ticks"""
+        x = block.x * self.cell_size
+        y = block.y * self.cell_size
+        prev = self.prev_block
+        if prev is not None and prev[0] is block and prev[1] == block.rotation:
+            alpha = self.timestep.alpha
+            x += round((prev[2] - block.x) * self.cell_size * (1 - alpha))
+            y += round((prev[3] - block.y) * self.cell_size * (1 - alpha))
+        return x, y
+
+    def process_sim_events(self):
+        """Turn simulation events into effects; returns True if the game topped out"""
+        topped_out = False
+        for event in self.sim.events:
+            kind = event[0]
+            if kind == "lock":
+                self.audio.play_sound("block_drop")
+            elif kind == "level_up":
+                self.audio.play_sound("level_up")
+            elif kind == "clear":
+                self.audio.play_sound("line_clear")
+                _, full_rows, row_colors = event
+                # Screen shake for big clears
+                if len(full_rows) >= 3:
+                    self.screen_shake = 10
+                # Particle effects
+                for y, colors in zip(full_rows, row_colors):
+                    for x, color in enumerate(colors):
+                        if not color:
+                            continue  # Rows cleared by a power-up can have gaps
+                        particle_x = (x * self.cell_size) + (self.cell_size / 2)
+                        particle_y = (y * self.cell_size) + (self.cell_size / 2)
+                        self.particles.emit(particle_x, particle_y, color, 15)
+            elif kind == "powerup":
+                power_up = event[1]
+                self.audio.play_sound("level_up")
+                self.particles.emit((power_up.x + 0.5) * self.cell_size, (power_up.y + 0.5) * self.cell_size,
+                                    POWERUP_COLORS[power_up.type], 30)
+            elif kind == "top_out":
+                self.audio.play_sound("game_over")
+                topped_out = True
+        self.sim.events.clear()
+        return topped_out
+
+    def handle_events(self, events):
+        """Handle one frame's events; gameplay input is applied on the next tick"""
+        for event in events:
+            self.handle_event(event)
+
+    def handle_event(self, event):
         if self.show_name_input:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
-                    await self.save_high_score()
+                    self.save_high_score()
                 elif event.key == pygame.K_BACKSPACE:
                     self.player_name = self.player_name[:-1]
                 else:
@@ -299,15 +399,20 @@ class Game:
                         self.player_name += event.unicode
             return
         
+        # Without a keyboard a tap outside the buttons starts a game from the menus
+        tapped = (
+            self.touch_controls is not None and event.type == pygame.FINGERUP
+            and self.touch_controls.handle_touch(self.touch_controls.finger_pos(event)) is None
+        )
+
         if not self.game_started:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     self.start_game()
                 elif event.key == pygame.K_h:
-                    print(f"H pressed! Current show_high_scores: {self.show_high_scores}")
                     self.toggle_high_scores()
-                    print(f"After toggle: {self.show_high_scores}")
-                    print(f"High scores data: {self.high_score_manager.high_scores}")
+            elif tapped:
+                self.start_game()
             return
 
         if self.game_over:
@@ -316,116 +421,48 @@ class Game:
                     self.reset_game()
                 elif event.key == pygame.K_m:
                     self.show_start_screen()
+            elif tapped:
+                self.reset_game()
             return
 
+        if self.input.handle_event(event):
+            return
         if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_LEFT:
-                self.move_block(-1, 0)
-            elif event.key == pygame.K_RIGHT:
-                self.move_block(1, 0)
-            elif event.key == pygame.K_DOWN:
-                self.move_block(0, 1)
-            elif event.key == pygame.K_UP:
-                self.rotate_block()
+            if event.key == pygame.K_g:
+                self.toggle_hint()
+            elif event.key == pygame.K_v:
+                self.toggle_ghost()
 
     def reset_game(self):
-        self.grid = [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)]
-        self.score = 0
+        self.sim.reset()
+        self.recorder = ReplayRecorder(self.sim)
         self.game_over = False
         self.game_started = True
-        self.last_fall_time = pygame.time.get_ticks()
-        self.start_time = pygame.time.get_ticks()
-        self.particles = []
-        self.current_block = None
-        self.next_block = None
-        self.generate_next_block()
-        self.spawn_block()
+        self.particles.clear()
+        self.prev_block = None
+        self.timestep.reset()
+        self.input.reset()
 
     def move_block(self, dx, dy):
-        self.current_block.x += dx
-        self.current_block.y += dy
-        if self.check_collision(self.current_block):
-            self.current_block.x -= dx
-            self.current_block.y -= dy
+        return self.sim.move_block(dx, dy)
 
     def rotate_block(self):
-        original_rotation = self.current_block.rotation
-        self.current_block.rotation = (self.current_block.rotation + 1) % 4
-        if self.check_collision(self.current_block):
-            self.current_block.rotation = original_rotation
+        return self.sim.rotate_block()
 
     def check_collision(self, block):
-        shape = block.get_rotated_shape()
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    grid_x = block.x + x
-                    grid_y = block.y + y
-                    if not (0 <= grid_x < self.grid_width and 0 <= grid_y < self.grid_height):
-                        return True
-                    if self.grid[grid_y][grid_x] != 0:
-                        return True
-        return False
+        return self.sim.check_collision(block)
 
     def lock_block(self):
-        shape = self.current_block.get_rotated_shape()
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    self.grid[self.current_block.y + y][self.current_block.x + x] = self.current_block.color
+        self.sim.lock_block()
 
     def clear_lines(self):
-        lines_cleared = 0
-        full_rows = []
-        for y, row in enumerate(self.grid):
-            if all(cell != 0 for cell in row):
-                lines_cleared += 1
-                full_rows.append(y)
-
-        if lines_cleared > 0:
-            # Combo system
-            current_time = pygame.time.get_ticks()
-            if current_time - self.last_clear_time < 3000:  # 3 second window
-                self.combo_count += 1
-            else:
-                self.combo_count = 1
-            self.last_clear_time = current_time
-            
-            # Screen shake for big clears
-            if lines_cleared >= 3:
-                self.screen_shake = 10
-            
-            # Enhanced scoring with combos
-            base_score = lines_cleared * 100 * self.level
-            combo_bonus = self.combo_count * 50
-            self.score += base_score + combo_bonus
-            
-            # Level progression
-            self.lines_cleared_total += lines_cleared
-            new_level = (self.lines_cleared_total // 10) + 1
-            if new_level > self.level:
-                self.level = new_level
-                self.game_tick = max(50, 500 - (self.level * 30))  # Faster drops
-            
-            # Particle effects
-            for y in full_rows:
-                for x in range(self.grid_width):
-                    for _ in range(15):  # More particles
-                        particle_x = (x * self.cell_size) + (self.cell_size / 2)
-                        particle_y = (y * self.cell_size) + (self.cell_size / 2)
-                        self.particles.append(Particle(particle_x, particle_y, self.grid[y][x]))
-
-            # Remove the cleared lines from the grid
-            new_grid = [row for i, row in enumerate(self.grid) if i not in full_rows]
-            # Add new empty lines at the top
-            for _ in range(lines_cleared):
-                new_grid.insert(0, [0 for _ in range(self.grid_width)])
-            self.grid = new_grid
+        lines_cleared = self.sim.clear_lines()
+        self.process_sim_events()
+        return lines_cleared
 
     def draw_particles(self, screen):
         """Draw particle effects"""
-        for particle in self.particles:
-            particle.draw(screen)
+        self.particles.draw(screen)
 
 
 
@@ -0,0 +1,85 @@
+import pygame
+from pieces import COLORS
+from perf import instruments, PHASES, HISTOGRAM_BOUNDS
+
+TARGET_FRAME_MS = 1000 / 60
+
+
+class PerfHUD:
+    """Overlay showing FPS, a frame time graph and histogram, phase times and counters.
+
+    The panel is drawn into a cached Surface that is only rebuilt every
+    ``refresh_ms`` so the overlay itself barely shows up in the numbers.
+    """
+
+    def __init__(self, text_cache, screen_width, refresh_ms=250):
+        self.text = text_cache
+        self.refresh_ms = refresh_ms
+        self.rect = pygame.Rect(0, 10, 250, 250)
+        self.resize(screen_width)
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.last_refresh = -refresh_ms
+
+    def resize(self, screen_width):
+        self.rect.right = screen_width - 10
+
+    def draw(self, screen):
+        if not instruments.enabled:
+            return
+        now = pygame.time.get_ticks()
+        if now - self.last_refresh >= self.refresh_ms:
+            self.last_refresh = now
+            self.rebuild()
+        screen.blit(self.surface, self.rect)
+
+    def rebuild(self):
+        surface = self.surface
+        surface.fill((0, 0, 0, 190))
+        pygame.draw.rect(surface, COLORS["green"], surface.get_rect(), 1)
+        frame_times = instruments.frame_times()
+        worst = max(frame_times, default=0.0)
+
+        lines = [(f"FPS {instruments.fps():.0f}  worst {worst:.1f} ms", COLORS["green"])]
+        averages = instruments.phase_averages()
+        lines.append(("  ".join(f"{phase} {averages.get(phase, 0.0):.1f}" for phase in PHASES[:3]), COLORS["white"]))
+        lines.append(("  ".join(f"{phase} {averages.get(phase, 0.0):.1f}" for phase in PHASES[3:]), COLORS["white"]))
+        counters = instruments.latest_counters()
+        if counters:
+            lines.append(("  ".join(f"{name} {value}" for name, value in counters.items()), COLORS["cyan"]))
+        status = []
+        if instruments.log is not None:
+            status.append("logging")
+        if instruments.profiling:
+            status.append("profiling")
+        if status:
+            lines.append((" ".join(status), COLORS["red"]))
+        y = 6
+        for text, color in lines:
+            surface.blit(self.text.render(text, 20, color), (8, y))
+            y += 18
+
+        self.draw_graph(surface, frame_times, pygame.Rect(8, 100, 234, 60))
+        self.draw_histogram(surface, instruments.histogram(), pygame.Rect(8, 175, 234, 65))
+
+    def draw_graph(self, surface, frame_times, area):
+        """One bar per recent frame, scaled so 2x the 60 FPS budget fills the area"""
+        scale = area.height / (TARGET_FRAME_MS * 2)
+        recent = frame_times[-area.width // 2:]
+        for i, ms in enumerate(recent):
+            height = min(area.height, int(ms * scale))
+            color = COLORS["green"] if ms <= TARGET_FRAME_MS * 1.2 else COLORS["red"]
+            x = area.right - (len(recent) - i) * 2
+            pygame.draw.line(surface, color, (x, area.bottom), (x, area.bottom - height))
+        budget_y = area.bottom - int(TARGET_FRAME_MS * scale)
+        pygame.draw.line(surface, COLORS["yellow"], (area.x, budget_y), (area.right, budget_y))
+
+    def draw_histogram(self, surface, buckets, area):
+        total = max(1, sum(buckets))
+        labels = [f"<{bound}" for bound in HISTOGRAM_BOUNDS] + [f"{HISTOGRAM_BOUNDS[-1]}+"]
+        slot = area.width // len(buckets)
+        bar_area = area.height - 16
+        for i, (count, label) in enumerate(zip(buckets, labels)):
+            height = int(bar_area * count / total)
+            bar = pygame.Rect(area.x + i * slot + 2, area.y + bar_area - height, slot - 4, height)
+            pygame.draw.rect(surface, COLORS["cyan"] if i < 2 else COLORS["orange"], bar)
+            surface.blit(self.text.render(label, 16, COLORS["white"]), (area.x + i * slot + 2, area.y + bar_area + 2))
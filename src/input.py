@@ -0,0 +1,160 @@
+import pygame
+
+from simulation import MOVE_LEFT, MOVE_RIGHT, SOFT_DROP, ROTATE, HARD_DROP
+
+# Event types that reach the queue at all; mouse motion, wheel, joystick and
+# window chatter are dropped by SDL instead of being dispatched every frame
+ALLOWED_EVENTS = (
+    pygame.QUIT,
+    pygame.VIDEORESIZE,
+    pygame.WINDOWFOCUSLOST,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.TEXTINPUT,  # pygame fills KEYDOWN.unicode from these
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.FINGERDOWN,
+    pygame.FINGERUP,
+    pygame.FINGERMOTION,  # Sliding a finger from one button onto another
+)
+
+KEY_ACTIONS = {
+    pygame.K_LEFT: MOVE_LEFT,
+    pygame.K_RIGHT: MOVE_RIGHT,
+    pygame.K_DOWN: SOFT_DROP,
+    pygame.K_UP: ROTATE,
+    pygame.K_SPACE: HARD_DROP,
+}
+
+# Actions that repeat while held
+REPEATING = (MOVE_LEFT, MOVE_RIGHT, SOFT_DROP)
+
+# Mouse clicks hold buttons like one more key; each finger is its own source
+POINTER = "pointer"
+
+
+def filter_events():
+    """Only let ALLOWED_EVENTS into the event queue"""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(ALLOWED_EVENTS)
+
+
+class InputController:
+    """Turns key and touch events into simulation actions, once per tick.
+
+    Events only update state: new presses are queued and held buttons are
+    tracked by the key or pointer holding them. ``poll``, called once per
+    simulation tick, turns that state into the tick's actions, so a burst
+    of events between two ticks still yields each action at most once
+    and input always lands on the next tick.
+
+    Held moves repeat with delayed auto-shift: one move on press, then
+    after ``das`` ticks one every ``arr`` ticks. When left and right are
+    both held the newer one wins. Soft drop repeats every
+    ``soft_drop_arr`` ticks from the press. Timing is counted in ticks,
+    so repeat speed follows the simulation clock, not the frame rate.
+    """
+
+    def __init__(self, das=10, arr=2, soft_drop_arr=2, touch=None):
+        self.das = das
+        self.arr = max(1, arr)
+        self.soft_drop_arr = max(1, soft_drop_arr)
+        self.touch = touch  # TouchControls mapping screen positions to actions
+        self.reset()
+
+    def reset(self):
+        self.pressed = []  # Actions pressed since the last poll, without duplicates
+        self.sources = {}  # Key or POINTER -> action it holds
+        self.held = {}  # Repeating action -> ticks held
+        self.shift = None  # Horizontal move that currently repeats
+
+    def press(self, action, source):
+        if source in self.sources:
+            return  # Already held, e.g. an OS key repeat
+        self.sources[source] = action
+        if action not in self.pressed:
+            self.pressed.append(action)
+        if action in REPEATING:
+            self.held[action] = 0
+            if action != SOFT_DROP:
+                self.shift = action
+
+    def release(self, source):
+        action = self.sources.pop(source, None)
+        if action is None or action in self.sources.values():
+            return
+        self.held.pop(action, None)
+        if action == self.shift:
+            # Fall back to the other direction if it's still held
+            self.shift = next((a for a in (MOVE_LEFT, MOVE_RIGHT) if a in self.held), None)
+
+    def release_all(self):
+        self.sources.clear()
+        self.held.clear()
+        self.shift = None
+
+    def slide(self, action, source):
+        """Move a held touch onto whatever button is now under it"""
+        if self.sources.get(source) == action:
+            return
+        self.release(source)
+        if action is not None:
+            self.press(action, source)
+
+    def handle_event(self, event):
+        """Update input state from an event; returns True if the event was used"""
+        if event.type == pygame.KEYDOWN:
+            action = KEY_ACTIONS.get(event.key)
+            if action is None:
+                return False
+            self.press(action, event.key)
+        elif event.type == pygame.KEYUP:
+            if event.key not in self.sources:
+                return False
+            self.release(event.key)
+        elif event.type in (pygame.FINGERDOWN, pygame.FINGERMOTION, pygame.FINGERUP):
+            if self.touch is None:
+                return False
+            source = ("finger", event.finger_id)
+            if event.type == pygame.FINGERUP:
+                self.release(source)
+            else:
+                action = self.touch.handle_touch(self.touch.finger_pos(event))
+                if event.type == pygame.FINGERMOTION:
+                    self.slide(action, source)
+                elif action is not None:
+                    self.press(action, source)
+        elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            if self.touch is None or event.button != 1 or getattr(event, "touch", False):
+                return False  # Mouse events SDL synthesizes from touches arrive as FINGER* too
+            if event.type == pygame.MOUSEBUTTONUP:
+                self.release(POINTER)
+            else:
+                action = self.touch.handle_touch(event.pos)
+                if action is None:
+                    return False
+                self.press(action, POINTER)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.release_all()  # Key-ups go to the other window; don't keep shifting
+        else:
+            return False
+        if self.touch is not None:
+            self.touch.set_held(self.sources.values())
+        return True
+
+    def poll(self):
+        """Actions for this tick: new presses, then due repeats"""
+        actions = self.pressed
+        self.pressed = []
+        for action, ticks in self.held.items():
+            if action in actions:
+                continue  # Pressed this tick; the press was its first move
+            ticks += 1
+            self.held[action] = ticks
+            if action == SOFT_DROP:
+                due = ticks % self.soft_drop_arr == 0
+            else:
+                due = action == self.shift and ticks >= self.das and (ticks - self.das) % self.arr == 0
+            if due:
+                actions.append(action)
+        return actions
@@ -0,0 +1,87 @@
+import pygame
+from game import COLORS
+
+DEFAULT_THEME = {
+    "gradient_top": (10, 5, 30),
+    "gradient_bottom": (30, 20, 70),
+    "panel": (20, 20, 40),
+    "next_border": COLORS["cyan"],
+    "stats_border": COLORS["yellow"],
+}
+
+
+def draw_gradient_background(screen, width, height, theme=DEFAULT_THEME):
+    """Draw a cool gradient background"""
+    top = theme["gradient_top"]
+    bottom = theme["gradient_bottom"]
+    for y in range(height):
+        color_ratio = y / height
+        r = int(top[0] + color_ratio * (bottom[0] - top[0]))
+        g = int(top[1] + color_ratio * (bottom[1] - top[1]))
+        b = int(top[2] + color_ratio * (bottom[2] - top[2]))
+        pygame.draw.line(screen, (r, g, b), (0, y), (width, y))
+
+
+def draw_neon_border(screen, rect, color, width=3):
+    """Draw a glowing neon border effect"""
+    for i in range(width):
+        expanded_rect = pygame.Rect(rect.x - i, rect.y - i, rect.width + 2*i, rect.height + 2*i)
+        pygame.draw.rect(screen, color, expanded_rect, 1)
+
+
+class LayerCache:
+    """Static screen layers rendered once and blitted every frame.
+
+    ``background`` is the gradient used by the menus, ``playfield`` adds the
+    panel chrome and the empty grid lines on top of it. Both are rebuilt
+    lazily after ``resize`` or ``set_theme``.
+    """
+
+    def __init__(self, width, height, game, theme=None):
+        self.width = width
+        self.height = height
+        self.game = game
+        self.theme = theme or DEFAULT_THEME
+        panel_x = game.grid_width * game.cell_size + 30
+        self.next_panel_rect = pygame.Rect(panel_x, 80, 200, 200)
+        self.stats_panel_rect = pygame.Rect(panel_x, 310, 200, 250)
+        self._background = None
+        self._playfield = None
+
+    def invalidate(self):
+        self._background = None
+        self._playfield = None
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        self.invalidate()
+
+    def set_theme(self, theme):
+        self.theme = theme
+        self.invalidate()
+
+    def _new_surface(self):
+        surface = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    @property
+    def background(self):
+        if self._background is None:
+            self._background = self._new_surface()
+            draw_gradient_background(self._background, self.width, self.height, self.theme)
+        return self._background
+
+    @property
+    def playfield(self):
+        if self._playfield is None:
+            surface = self.background.copy()
+            self.game.draw_grid_lines(surface)
+            for rect, border in ((self.next_panel_rect, self.theme["next_border"]),
+                                 (self.stats_panel_rect, self.theme["stats_border"])):
+                pygame.draw.rect(surface, self.theme["panel"], rect)
+                draw_neon_border(surface, rect, border)
+            self._playfield = surface
+        return self._playfield
@@ -0,0 +1,72 @@
+import bisect
+
+
+class Leaderboard:
+    """Bounded, always-sorted score table with cached extremes and display rows.
+
+    Entries are dicts with ``name``, ``score`` and ``time``, kept highest
+    score first and older first on ties, next to a parallel list of sort
+    keys so inserts, ``rank_of`` and ``qualifies`` are binary searches.
+    ``best`` and ``worst`` are plain attributes updated on insert, and the
+    formatted ``rows`` are only re-formatted from the first position an
+    insert shifted.
+    """
+
+    def __init__(self, capacity=5, entries=()):
+        self.capacity = capacity
+        self.load(entries)
+
+    def load(self, entries):
+        entries = sorted(entries, key=self.sort_key)[:self.capacity]
+        self.entries = [dict(e) for e in entries]
+        self.keys = [self.sort_key(e) for e in self.entries]
+        self._rows = []
+        self._update_extremes()
+
+    @staticmethod
+    def sort_key(entry):
+        return (-entry["score"], entry.get("time", 0))
+
+    def _update_extremes(self):
+        self.best = self.entries[0]["score"] if self.entries else 0
+        self.worst = self.entries[-1]["score"] if self.entries else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @property
+    def full(self):
+        return len(self.entries) >= self.capacity
+
+    def rank_of(self, score):
+        """1-based rank a new score would get; ties go below existing entries"""
+        return bisect.bisect_right(self.keys, (-score, float("inf"))) + 1
+
+    def qualifies(self, score):
+        """Whether a score would make the table"""
+        return self.rank_of(score) <= self.capacity
+
+    def insert(self, entry):
+        """Add an entry; returns its rank, or None if it didn't make the table"""
+        key = self.sort_key(entry)
+        index = bisect.bisect_right(self.keys, key)
+        if index >= self.capacity:
+            return None
+        self.keys.insert(index, key)
+        self.entries.insert(index, dict(entry))
+        del self.keys[self.capacity:]
+        del self.entries[self.capacity:]
+        del self._rows[index:]  # Rows from here on moved down a rank
+        self._update_extremes()
+        return index + 1
+
+    def rows(self, limit=None):
+        """Formatted "rank. name: score" lines, formatted once per change"""
+        end = len(self.entries) if limit is None else min(limit, len(self.entries))
+        for i in range(len(self._rows), end):
+            entry = self.entries[i]
+            self._rows.append(f"{i + 1}. {entry['name']}: {entry['score']:,}")
+        return self._rows[:end]
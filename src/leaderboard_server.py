@@ -0,0 +1,161 @@
+"""Minimal leaderboard HTTP service on the standard library.
+
+    GET  /scores?limit=N   {"version": v, "scores": [...]}, with an ETag;
+                           If-None-Match answers 304 when nothing changed
+    POST /scores           {"scores": [{"id", "name", "score", "time"}, ...]}
+                           Entries are deduplicated by id, so retries are safe
+
+Run ``python src/leaderboard_server.py --port 8765`` and start the game
+with ``NEON_TETRIS_LEADERBOARD=http://localhost:8765``.
+"""
+import argparse
+import json
+import math
+import sqlite3
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from database import SQLiteScoreStore, MIN_SCORE, MAX_SCORE
+
+MAX_LIMIT = 100
+MAX_BATCH = 500
+MAX_BODY = 256 * 1024
+
+
+class LeaderboardService:
+    """Thread-safe wrapper around a SQLiteScoreStore plus upload dedup"""
+
+    def __init__(self, path):
+        self.store = SQLiteScoreStore(path, legacy_json=None, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.store.db:
+            self.store.db.execute("CREATE TABLE IF NOT EXISTS submissions (id TEXT PRIMARY KEY)")
+        self.version = self.store.count()  # Changes whenever the table does; used for ETags
+        self.top_cache = {}
+
+    def top(self, limit):
+        with self.lock:
+            cached = self.top_cache.get(limit)
+            if cached is None or cached[0] != self.version:
+                body = json.dumps({"version": self.version, "scores": self.store.top(limit)}).encode()
+                cached = (self.version, body)
+                self.top_cache[limit] = cached
+            return cached
+
+    def submit(self, entries):
+        """Store entries whose id hasn't been seen; returns how many were new"""
+        with self.lock, self.store.db:
+            new = []
+            for entry in entries:
+                cursor = self.store.db.execute("INSERT OR IGNORE INTO submissions (id) VALUES (?)", (entry["id"],))
+                if cursor.rowcount:
+                    new.append(entry)
+            if new:
+                self.store.db.executemany(
+                    "INSERT INTO scores (name, score, created) VALUES (?, ?, ?)",
+                    [(e["name"], e["score"], e["time"]) for e in new],
+                )
+                self.version += len(new)
+        return len(new)
+
+
+def parse_entries(payload):
+    """Validated entries from a POST body, or None if it is malformed"""
+    if not isinstance(payload, dict) or not isinstance(payload.get("scores"), list):
+        return None
+    entries = []
+    for item in payload["scores"][:MAX_BATCH]:
+        try:
+            entries.append({
+                "id": str(item["id"])[:64],
+                "name": str(item["name"])[:15] or "Anonymous",
+                "score": int(item["score"]),
+                "time": float(item["time"]),
+            })
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return None  # OverflowError: int() of an infinite float such as 1e999
+        entry = entries[-1]
+        if not MIN_SCORE <= entry["score"] <= MAX_SCORE or not math.isfinite(entry["time"]):
+            return None  # NaN or infinite times can't be stored or sent back as JSON
+    return entries
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse one connection
+    service = None
+
+    def send_json(self, status, body, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/scores":
+            return self.send_json(404, b'{"error": "not found"}')
+        try:
+            limit = int(parse_qs(url.query).get("limit", ["10"])[0])
+        except ValueError:
+            return self.send_json(400, b'{"error": "bad limit"}')
+        limit = max(1, min(limit, MAX_LIMIT))
+        version, body = self.service.top(limit)
+        etag = f'"{version}-{limit}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_json(200, body, [("ETag", etag)])
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/scores":
+            return self.send_json(404, b'{"error": "not found"}')
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            return self.send_json(413, b'{"error": "too large"}')
+        try:
+            entries = parse_entries(json.loads(self.rfile.read(length)))
+        except ValueError:
+            entries = None
+        if entries is None:
+            return self.send_json(400, b'{"error": "bad scores"}')
+        try:
+            accepted = self.service.submit(entries)
+        except sqlite3.Error:
+            return self.send_json(503, b'{"error": "storage failed"}')  # Rolled back; the client retries
+        self.send_json(200, json.dumps({"accepted": accepted, "version": self.service.version}).encode())
+
+    def log_message(self, format, *args):
+        pass  # Quiet; a game client polls this
+
+
+def make_server(host="127.0.0.1", port=8765, path="leaderboard.db"):
+    handler = type("BoundHandler", (Handler,), {"service": LeaderboardService(path)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the leaderboard service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default="leaderboard.db")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.db)
+    print(f"Leaderboard on http://{args.host}:{args.port}/scores")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
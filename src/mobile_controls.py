@@ -1,38 +1,96 @@
 import pygame
 
+from simulation import MOVE_LEFT, MOVE_RIGHT, SOFT_DROP, ROTATE, HARD_DROP
+
+BUTTON_COLORS = {
+    MOVE_LEFT: (100, 100, 255),
+    MOVE_RIGHT: (100, 100, 255),
+    SOFT_DROP: (100, 255, 100),
+    HARD_DROP: (255, 255, 100),
+    ROTATE: (255, 100, 100),
+}
+
+# Side of one hit-test grid cell in pixels
+HIT_CELL = 20
+
+
 class TouchControls:
+    """On-screen buttons for touch screens.
+
+    ``handle_touch`` maps a position to an action through a coarse grid
+    built once per layout: each cell lists the few buttons overlapping
+    it, so a touch tests at most those rects instead of every button.
+    The buttons are drawn into one cached Surface, re-rendered only when
+    the set of held buttons changes. Presses and releases go through
+    InputController, so held buttons repeat like held keys.
+    """
+
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.button_size = 60
+        self.held = frozenset()  # Actions shown as pressed
         self.setup_buttons()
-        
+
     def setup_buttons(self):
         # Control buttons for mobile
         margin = 20
-        bottom = self.screen_height - margin - self.button_size
-        
+        size = self.button_size
+        bottom = self.screen_height - margin - size
+        right = self.screen_width - margin - size
+
         self.buttons = {
-            'left': pygame.Rect(margin, bottom, self.button_size, self.button_size),
-            'right': pygame.Rect(margin + self.button_size + 10, bottom, self.button_size, self.button_size),
-            'rotate': pygame.Rect(self.screen_width - margin - self.button_size, bottom, self.button_size, self.button_size),
-            'down': pygame.Rect(self.screen_width - margin - self.button_size * 2 - 10, bottom, self.button_size, self.button_size)
+            MOVE_LEFT: pygame.Rect(margin, bottom, size, size),
+            MOVE_RIGHT: pygame.Rect(margin + size + 10, bottom, size, size),
+            ROTATE: pygame.Rect(right, bottom, size, size),
+            SOFT_DROP: pygame.Rect(right - size - 10, bottom, size, size),
+            HARD_DROP: pygame.Rect(right - (size + 10) * 2, bottom, size, size),
         }
-    
-    def handle_touch(self, pos):
+        self.rect = pygame.Rect(self.buttons[MOVE_LEFT]).unionall(list(self.buttons.values()))
+        self.build_hit_grid()
+        self.surface = None
+
+    def build_hit_grid(self):
+        self.grid_columns = self.screen_width // HIT_CELL + 1
+        self.hit_grid = [()] * (self.grid_columns * (self.screen_height // HIT_CELL + 1))
         for action, rect in self.buttons.items():
+            for gy in range(rect.top // HIT_CELL, (rect.bottom - 1) // HIT_CELL + 1):
+                for gx in range(rect.left // HIT_CELL, (rect.right - 1) // HIT_CELL + 1):
+                    index = gy * self.grid_columns + gx
+                    self.hit_grid[index] += ((action, rect),)
+
+    def handle_touch(self, pos):
+        """Action of the button at a screen position, or None"""
+        x, y = pos
+        if not (0 <= x < self.screen_width and 0 <= y < self.screen_height):
+            return None
+        for action, rect in self.hit_grid[int(y) // HIT_CELL * self.grid_columns + int(x) // HIT_CELL]:
             if rect.collidepoint(pos):
                 return action
         return None
-    
-    def draw(self, screen):
-        colors = {
-            'left': (100, 100, 255),
-            'right': (100, 100, 255),
-            'rotate': (255, 100, 100),
-            'down': (100, 255, 100)
-        }
-        
+
+    def finger_pos(self, event):
+        """Screen position of a FINGER* event, whose coordinates are 0..1"""
+        return event.x * self.screen_width, event.y * self.screen_height
+
+    def set_held(self, actions):
+        held = frozenset(actions) & self.buttons.keys()
+        if held != self.held:
+            self.held = held
+            self.surface = None
+
+    def render(self):
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
         for action, rect in self.buttons.items():
-            pygame.draw.rect(screen, colors[action], rect)
-            pygame.draw.rect(screen, (255, 255, 255), rect, 2)
\ No newline at end of file
+            color = BUTTON_COLORS[action]
+            if action in self.held:
+                color = tuple(min(255, c + 80) for c in color)
+            local = rect.move(-self.rect.x, -self.rect.y)
+            pygame.draw.rect(surface, color, local)
+            pygame.draw.rect(surface, (255, 255, 255), local, 2)
+        return surface
+
+    def draw(self, screen):
+        if self.surface is None:
+            self.surface = self.render()
+        screen.blit(self.surface, self.rect)
@@ -0,0 +1,115 @@
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as parallel NumPy arrays.
+
+    Dead slots go back on a free-list and are reused by later bursts.
+    Once the pool is full, new particles are dropped instead of growing it.
+    """
+
+    def __init__(self, capacity=2048, lifetime=60, gravity=0.1):
+        self.capacity = capacity
+        self.max_lifetime = lifetime
+        self.gravity = gravity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.velocity_x = np.zeros(capacity, dtype=np.float32)
+        self.velocity_y = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = {}
+        self.rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def clear(self):
+        """Kill every particle and return all slots to the free-list"""
+        self.alive[:] = False
+        self.lifetime[:] = 0
+        self.free = list(range(self.capacity - 1, -1, -1))
+
+    def emit(self, x, y, color, count):
+        """Spawn up to count particles at (x, y)"""
+        count = min(count, len(self.free))
+        if count <= 0:
+            return
+        slots = np.array([self.free.pop() for _ in range(count)], dtype=np.intp)
+        color_index = self.palette_index.get(color)
+        if color_index is None:
+            color_index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = color_index
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.velocity_x[slots] = self.rng.uniform(-3, 3, count)
+        self.velocity_y[slots] = self.rng.uniform(-5, -1, count)
+        self.lifetime[slots] = self.max_lifetime
+        self.color[slots] = color_index
+        self.alive[slots] = True
+
+    def update(self):
+        """Advance every live particle by one frame"""
+        if len(self.free) == self.capacity:
+            return
+        alive = self.alive
+        self.x += self.velocity_x * alive
+        self.y += self.velocity_y * alive
+        self.velocity_y += self.gravity * alive
+        self.lifetime -= alive
+
+        dead = np.flatnonzero(alive & (self.lifetime <= 0))
+        if dead.size:
+            alive[dead] = False
+            self.free.extend(dead.tolist())
+
+    def bounds(self):
+        """Screen Rect covering every live particle, or None when there are none"""
+        index = np.flatnonzero(self.alive)
+        if not index.size:
+            return None
+        xs = self.x[index]
+        ys = self.y[index]
+        left = int(xs.min()) - 4
+        top = int(ys.min()) - 4
+        return pygame.Rect(left, top, int(xs.max()) + 5 - left, int(ys.max()) + 5 - top)
+
+    def get_sprite(self, color_index, radius):
+        """Cached circle Surface for a palette color and radius"""
+        key = (color_index, radius)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, self.palette[color_index], (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, screen):
+        """Draw all live particles with a single blits call"""
+        index = np.flatnonzero(self.alive)
+        if not index.size:
+            return
+        radius = (4 * self.lifetime[index].astype(np.int32)) // self.max_lifetime
+        visible = radius > 0
+        index = index[visible]
+        radius = radius[visible]
+        left = self.x[index].astype(np.int32) - radius
+        top = self.y[index].astype(np.int32) - radius
+
+        get_sprite = self.get_sprite
+        screen.blits(
+            [
+                (get_sprite(c, r), (lx, ty))
+                for c, r, lx, ty in zip(
+                    self.color[index].tolist(), radius.tolist(), left.tolist(), top.tolist()
+                )
+            ],
+            doreturn=False,
+        )
@@ -0,0 +1,244 @@
+"""Lightweight instrumentation: per-frame phase timers, named timers and counters.
+
+Everything goes through the module-level ``instruments`` object. While it
+is disabled, ``mark`` and ``count`` return after one attribute check and
+``timer`` hands back a shared no-op context manager, so the hooks can stay
+in hot code.
+"""
+import time
+from collections import deque
+
+PHASES = ("input", "update", "draw", "flip", "wait")
+# Upper bounds in ms for the frame time histogram; the last bucket is open
+HISTOGRAM_BOUNDS = (8, 17, 25, 33, 50, 100)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("instruments", "name", "start")
+
+    def __init__(self, instruments, name):
+        self.instruments = instruments
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.instruments.add_time(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class Instruments:
+    """Frame sampler with named timers and counters.
+
+    Call ``begin_frame`` at the top of the loop, ``mark(phase)`` after each
+    phase and ``end_frame`` last, so a sample's ``frame_ms`` is the full
+    frame interval including the wait for the frame cap. Named timer totals
+    and counters are accumulated per frame and kept, with the frame and
+    phase times, in a rolling window of ``window`` samples.
+    """
+
+    def __init__(self, window=240):
+        self.enabled = False
+        self.active = False  # HUD or log wants samples; a plain attribute keeps hooks cheap
+        self.samples = deque(maxlen=window)
+        self.timers = {}
+        self.counters = {}
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.phases = {}
+        self.log = None
+        self.profiler = None
+        self.profile_frames = 0
+        self.profile_path = None
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.active = enabled or self.log is not None
+        self.samples.clear()
+        self._restart_frame()
+
+    def _restart_frame(self):
+        # Sampling can start mid-frame; don't charge the partial frame to a phase
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.phases = {}
+        self.timers = {}
+        self.counters = {}
+
+    # Hooks
+
+    def begin_frame(self):
+        if self.active:
+            self.frame_start = self.last_mark = time.perf_counter()
+            self.phases = {}
+
+    def mark(self, phase):
+        """Attribute the time since the previous mark to phase"""
+        if not self.active:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def timer(self, name):
+        """Context manager adding its elapsed time to the named timer"""
+        if not self.active:
+            return NULL_TIMER
+        return _Timer(self, name)
+
+    def add_time(self, name, ms):
+        self.timers[name] = self.timers.get(name, 0.0) + ms
+
+    def count(self, name, value=1):
+        if self.active:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """Record the current value of something, e.g. live particles"""
+        if self.active:
+            self.counters[name] = value
+
+    def end_frame(self):
+        if self.profiler is not None:
+            self._profile_tick()
+        if not self.active:
+            return
+        sample = {
+            "t": self.frame_start,
+            "frame_ms": (time.perf_counter() - self.frame_start) * 1000,
+            "phases": self.phases,
+            "timers": self.timers,
+            "counters": self.counters,
+        }
+        self.samples.append(sample)
+        self.timers = {}
+        self.counters = {}
+        if self.log is not None:
+            self.log.info(self._format_sample(sample))
+
+    # Summaries
+
+    def fps(self):
+        """Average frames per second over the window"""
+        if len(self.samples) < 2:
+            return 0.0
+        span = self.samples[-1]["t"] - self.samples[0]["t"]
+        return (len(self.samples) - 1) / span if span > 0 else 0.0
+
+    def frame_times(self):
+        return [sample["frame_ms"] for sample in self.samples]
+
+    def histogram(self):
+        """Frame counts per HISTOGRAM_BOUNDS bucket, plus one for slower frames"""
+        buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for ms in self.frame_times():
+            for i, bound in enumerate(HISTOGRAM_BOUNDS):
+                if ms < bound:
+                    buckets[i] += 1
+                    break
+            else:
+                buckets[-1] += 1
+        return buckets
+
+    def phase_averages(self):
+        """Average ms per frame for each phase over the window"""
+        if not self.samples:
+            return {}
+        totals = {}
+        for sample in self.samples:
+            for phase, ms in sample["phases"].items():
+                totals[phase] = totals.get(phase, 0.0) + ms
+        return {phase: total / len(self.samples) for phase, total in totals.items()}
+
+    def latest_counters(self):
+        return self.samples[-1]["counters"] if self.samples else {}
+
+    # Streaming to disk
+
+    def start_log(self, path="perf.log", max_bytes=1024 * 1024, backups=3):
+        """Stream one line per frame to a size-rotated log file"""
+        if self.log is not None:
+            return
+        import logging.handlers  # Only needed once logging is turned on
+        logger = logging.getLogger("neon_tetris.perf")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        logger.addHandler(handler)
+        self.log = logger
+        self.active = True
+        self._restart_frame()
+        self.log.info("time frame_ms " + " ".join(PHASES) + " timers counters")
+
+    def stop_log(self):
+        if self.log is None:
+            return
+        for handler in list(self.log.handlers):
+            handler.close()
+            self.log.removeHandler(handler)
+        self.log = None
+        self.active = self.enabled
+
+    def toggle_log(self, path="perf.log"):
+        if self.log is None:
+            self.start_log(path)
+        else:
+            self.stop_log()
+
+    @staticmethod
+    def _format_sample(sample):
+        phases = " ".join(f"{sample['phases'].get(phase, 0.0):.3f}" for phase in PHASES)
+        timers = ",".join(f"{name}={ms:.3f}" for name, ms in sample["timers"].items()) or "-"
+        counters = ",".join(f"{name}={value}" for name, value in sample["counters"].items()) or "-"
+        return f"{sample['t']:.4f} {sample['frame_ms']:.3f} {phases} {timers} {counters}"
+
+    # cProfile capture
+
+    def capture_profile(self, frames=300, path="profile.prof"):
+        """Profile the next frames and dump pstats to path; no-op if already capturing"""
+        if self.profiler is not None:
+            return
+        import cProfile
+        self.profiler = cProfile.Profile()
+        self.profile_frames = frames
+        self.profile_path = path
+        self.profiler.enable()
+
+    def _profile_tick(self):
+        self.profile_frames -= 1
+        if self.profile_frames > 0:
+            return
+        profiler = self.profiler
+        self.profiler = None
+        profiler.disable()
+        profiler.dump_stats(self.profile_path)
+        import io
+        import pstats
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+        print(f"Profile written to {self.profile_path}")
+        print(summary.getvalue())
+
+    @property
+    def profiling(self):
+        return self.profiler is not None
+
+
+instruments = Instruments()
@@ -0,0 +1,136 @@
+from board import shape_row_masks
+
+# Enhanced color palette with neon/glow effects
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 50, 50),
+    "green": (50, 255, 50),
+    "blue": (50, 50, 255),
+    "cyan": (50, 255, 255),
+    "magenta": (255, 50, 255),
+    "yellow": (255, 255, 50),
+    "orange": (255, 165, 50),
+    "purple": (200, 50, 255),
+    "lime": (150, 255, 50),
+    "pink": (255, 100, 150),
+}
+
+# Colors a falling block can take (skip black and white)
+PIECE_COLORS = list(COLORS.values())[2:]
+
+# Block shapes in their spawn orientation
+SHAPES = {
+    "I": [
+        [0, 0, 0, 0],
+        [1, 1, 1, 1],
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+    ],
+    "J": [
+        [1, 0, 0],
+        [1, 1, 1],
+        [0, 0, 0],
+    ],
+    "L": [
+        [0, 0, 1],
+        [1, 1, 1],
+        [0, 0, 0],
+    ],
+    "O": [
+        [1, 1],
+        [1, 1],
+    ],
+    "S": [
+        [0, 1, 1],
+        [1, 1, 0],
+        [0, 0, 0],
+    ],
+    "T": [
+        [0, 1, 0],
+        [1, 1, 1],
+        [0, 0, 0],
+    ],
+    "Z": [
+        [1, 1, 0],
+        [0, 1, 1],
+        [0, 0, 0],
+    ],
+}
+
+# Horizontal offsets tried in order when a rotation collides
+KICKS = {
+    "I": ((0, 0), (-1, 0), (1, 0), (-2, 0), (2, 0)),
+    "O": ((0, 0),),
+}
+DEFAULT_KICKS = ((0, 0), (-1, 0), (1, 0))
+
+
+class PieceGeometry:
+    """Frozen geometry of one shape in one rotation.
+
+    Offsets are relative to the top-left corner of the rotated shape
+    matrix, which is where ``Block.x``/``Block.y`` point. ``bottoms`` holds
+    (dx, dy) of the lowest cell in each occupied column.
+    """
+
+    __slots__ = ("name", "rotation", "matrix", "cells", "row_masks", "bottoms",
+                 "min_x", "max_x", "min_y", "max_y", "width", "height")
+
+    def __init__(self, name, rotation, matrix):
+        self.name = name
+        self.rotation = rotation
+        self.matrix = tuple(tuple(row) for row in matrix)
+        self.cells = tuple(
+            (x, y) for y, row in enumerate(self.matrix) for x, cell in enumerate(row) if cell
+        )
+        self.row_masks = shape_row_masks(self.matrix)
+        lowest = {}
+        for x, y in self.cells:
+            lowest[x] = max(lowest.get(x, y), y)
+        self.bottoms = tuple(sorted(lowest.items()))
+        xs = [x for x, _ in self.cells]
+        ys = [y for _, y in self.cells]
+        self.min_x, self.max_x = min(xs), max(xs)
+        self.min_y, self.max_y = min(ys), max(ys)
+        self.width = self.max_x - self.min_x + 1
+        self.height = self.max_y - self.min_y + 1
+
+
+def _rotate(matrix):
+    """Rotate a shape matrix 90 degrees clockwise"""
+    return [list(row) for row in zip(*matrix[::-1])]
+
+
+def _build_rotation_table():
+    table = {}
+    for name, shape in SHAPES.items():
+        rotations = []
+        matrix = shape
+        for rotation in range(4):
+            rotations.append(PieceGeometry(name, rotation, matrix))
+            matrix = _rotate(matrix)
+        table[name] = tuple(rotations)
+    return table
+
+
+# ROTATIONS[name][rotation] -> PieceGeometry, built once at import
+ROTATIONS = _build_rotation_table()
+
+
+class Block:
+    def __init__(self, name, color):
+        self.name = name
+        self.shape = SHAPES[name]
+        self.color = color
+        self.rotation = 0
+        self.x = 0
+        self.y = 0
+
+    @property
+    def geometry(self):
+        """Precomputed geometry for the current rotation"""
+        return ROTATIONS[self.name][self.rotation]
+
+    def get_rotated_shape(self):
+        return ROTATIONS[self.name][self.rotation].matrix
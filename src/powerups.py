@@ -1,44 +1,108 @@
-import random
-import pygame
+import heapq
+
+POWERUP_TYPES = ('clear_line', 'slow_time', 'ghost_block')
+LIFETIME = 300  # Ticks a power-up stays on the board (5 seconds)
+EFFECT_TICKS = 600  # Ticks slow_time and ghost_block last (10 seconds)
+
 
 class PowerUp:
-    def __init__(self, type_name, x, y):
+    __slots__ = ("type", "x", "y", "expires")
+
+    def __init__(self, type_name, x, y, expires):
         self.type = type_name
         self.x = x
         self.y = y
-        self.lifetime = 300  # 5 seconds at 60fps
-        
-    def update(self):
-        self.lifetime -= 1
-        
-    def draw(self, screen, cell_size):
-        if self.lifetime > 0:
-            alpha = min(255, self.lifetime * 2)
-            color = (255, 255, 0, alpha)  # Yellow glow
-            rect = pygame.Rect(self.x * cell_size, self.y * cell_size, cell_size, cell_size)
-            pygame.draw.rect(screen, color[:3], rect)
-            pygame.draw.rect(screen, (255, 255, 255), rect, 2)
+        self.expires = expires  # Simulation frame it disappears on
+
 
 class PowerUpManager:
-    def __init__(self):
-        self.power_ups = []
-        self.spawn_chance = 0.1  # 10% chance per line clear
-        
-    def maybe_spawn_powerup(self, cleared_rows, grid_width):
-        if random.random() < self.spawn_chance:
-            x = random.randint(0, grid_width - 1)
-            y = random.choice(cleared_rows)
-            power_type = random.choice(['clear_line', 'slow_time', 'ghost_block'])
-            self.power_ups.append(PowerUp(power_type, x, y))
-    
-    def update(self):
-        self.power_ups = [p for p in self.power_ups if p.lifetime > 0]
-        for power_up in self.power_ups:
-            power_up.update()
-    
-    def check_collection(self, block_x, block_y):
-        for power_up in self.power_ups[:]:
-            if power_up.x == block_x and power_up.y == block_y:
-                self.power_ups.remove(power_up)
-                return power_up.type
-        return None
\ No newline at end of file
+    """Power-ups sitting in empty board cells, indexed like the bitboard.
+
+    ``masks[y]`` has bit x set when a power-up occupies cell (x, y), so a
+    locked piece collects by AND-ing its row masks against it, the same
+    way Board.collides tests cells. Expiry times live in a heap; entries
+    for power-ups no longer on the board (collected, replaced or cleared
+    with their row) are skipped when popped. Power-ups that a line clear
+    moves down are the same objects, so they still expire on time.
+    Randomness comes from the Simulation's seeded rng so replays match.
+    """
+
+    def __init__(self, width, height, rng, spawn_chance=0.1):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.spawn_chance = spawn_chance  # 10% chance per line clear
+        self.reset()
+
+    def reset(self):
+        self.power_ups = {}  # (x, y) -> PowerUp
+        self.masks = [0] * self.height
+        self.expiry = []  # (frame, seq, power_up)
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.power_ups)
+
+    def __iter__(self):
+        return iter(self.power_ups.values())
+
+    def add(self, type_name, x, y, frame):
+        power_up = PowerUp(type_name, x, y, frame + LIFETIME)
+        self.power_ups[x, y] = power_up
+        self.masks[y] |= 1 << x
+        heapq.heappush(self.expiry, (power_up.expires, self.seq, power_up))
+        self.seq += 1
+        return power_up
+
+    def remove(self, power_up):
+        del self.power_ups[power_up.x, power_up.y]
+        self.masks[power_up.y] &= ~(1 << power_up.x)
+
+    def maybe_spawn_powerup(self, cleared_rows, board, frame):
+        """After a clear, maybe drop a power-up into an empty cell of a row the clear touched"""
+        if self.rng.random() >= self.spawn_chance:
+            return None
+        type_name = self.rng.choice(POWERUP_TYPES)
+        y = self.rng.choice(cleared_rows)
+        free = ~(board.rows[y] | self.masks[y]) & board.full_mask
+        if not free:
+            return None
+        columns = [x for x in range(self.width) if free >> x & 1]
+        return self.add(type_name, self.rng.choice(columns), y, frame)
+
+    def expire(self, frame):
+        """Drop every power-up whose lifetime ended at or before frame"""
+        expiry = self.expiry
+        while expiry and expiry[0][0] <= frame:
+            _, _, power_up = heapq.heappop(expiry)
+            if self.power_ups.get((power_up.x, power_up.y)) is power_up:
+                self.remove(power_up)
+
+    def check_collection(self, row_masks, x, y):
+        """Collect every power-up under a piece footprint; returns the collected ones"""
+        collected = []
+        for dy, mask in row_masks:
+            shifted = mask << x if x >= 0 else mask >> -x
+            hits = self.masks[y + dy] & shifted
+            while hits:
+                low = hits & -hits
+                power_up = self.power_ups[low.bit_length() - 1, y + dy]
+                self.remove(power_up)
+                collected.append(power_up)
+                hits ^= low
+        return collected
+
+    def clear_rows(self, full_rows):
+        """Move power-ups down with the rows above cleared lines"""
+        if not self.power_ups:
+            return
+        cleared = sorted(full_rows)
+        moved = list(self.power_ups.values())
+        self.power_ups = {}
+        self.masks = [0] * self.height
+        for power_up in moved:
+            if power_up.y in cleared:
+                continue  # Row cleared by a clear_line power-up; it wasn't full, so it may hold power-ups
+            power_up.y += len(cleared) - sum(1 for row in cleared if row < power_up.y)
+            self.power_ups[power_up.x, power_up.y] = power_up
+            self.masks[power_up.y] |= 1 << power_up.x
@@ -0,0 +1,57 @@
+import random
+from collections import deque
+
+from pieces import SHAPES, PIECE_COLORS
+
+BAG = "bag"
+PURE_RANDOM = "random"
+
+
+class PieceGenerator:
+    """Seeded piece sequence with a lookahead queue.
+
+    ``policy`` is ``"bag"`` (every shape once per shuffled bag of seven) or
+    ``"random"`` (independent uniform draws). The same seed and policy
+    always produce the same sequence of (shape name, color) pairs.
+    """
+
+    def __init__(self, seed=None, policy=PURE_RANDOM, preview=3):
+        if policy not in (BAG, PURE_RANDOM):
+            raise ValueError(f"Unknown piece policy: {policy!r}")
+        self.seed = seed
+        self.policy = policy
+        self.preview = max(1, preview)
+        self.rng = random.Random(seed)
+        self.names = list(SHAPES)
+        self.bag = []
+        self.queue = deque()
+        self._fill()
+
+    def _draw(self):
+        rng = self.rng
+        if self.policy == BAG:
+            if not self.bag:
+                self.bag = self.names[:]
+                rng.shuffle(self.bag)
+            name = self.bag.pop()
+        else:
+            name = rng.choice(self.names)
+        return (name, rng.choice(PIECE_COLORS))
+
+    def _fill(self):
+        queue = self.queue
+        while len(queue) < self.preview:
+            queue.append(self._draw())
+
+    def next(self):
+        """Pop the next (name, color) pair and refill the preview queue"""
+        piece = self.queue.popleft()
+        self._fill()
+        return piece
+
+    def peek(self, index=0):
+        """Upcoming (name, color) pair without consuming it"""
+        return self.queue[index]
+
+    def __len__(self):
+        return len(self.queue)
@@ -0,0 +1,255 @@
+import pygame
+from game import COLORS
+from pieces import ROTATIONS
+from layers import LayerCache
+from text_cache import TextCache
+from hud import PerfHUD
+
+VISIBLE_HIGH_SCORES = 5  # Rows that fit on the high scores screen
+
+
+class Renderer:
+    """Draws every screen of the game onto any target Surface"""
+
+    def __init__(self, screen_width, screen_height, game):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.game = game
+        self.layers = LayerCache(screen_width, screen_height, game)
+        self.text = TextCache()
+        self.hud = PerfHUD(self.text, screen_width)
+
+        # Shared semi-transparent overlay for the name input and game over screens
+        self.overlay = pygame.Surface((screen_width, screen_height))
+        self.overlay.set_alpha(180)
+        self.overlay.fill((0, 0, 0))
+
+    def resize(self, width, height):
+        self.screen_width = width
+        self.screen_height = height
+        self.layers.resize(width, height)
+        self.hud.resize(width)
+        self.overlay = pygame.Surface((width, height))
+        self.overlay.set_alpha(180)
+        self.overlay.fill((0, 0, 0))
+
+    def draw_start_screen(self, screen, game):
+        """Draw the start screen"""
+        # Title
+        self.text.blit(screen, "NEON TETRIS", 96, COLORS["cyan"], center=(self.screen_width // 2, 150))
+        
+        # Subtitle
+        self.text.blit(screen, "Block Puzzle Game", 48, COLORS["magenta"], center=(self.screen_width // 2, 220))
+        
+        # Instructions
+        instructions = [
+            "Press SPACE to Start",
+            "Press H for High Scores",
+            "",
+            "Controls:",
+            "Arrow Keys - Move/Rotate",
+            "Down Arrow - Drop Faster",
+            "Space - Hard Drop",
+            "G - Placement Hint, V - Ghost Piece"
+        ]
+        
+        y_start = 320
+        for i, instruction in enumerate(instructions):
+            if instruction == "":
+                y_start += 20
+                continue
+            color = COLORS["yellow"] if i < 2 else COLORS["white"]
+            self.text.blit(screen, instruction, 36, color, center=(self.screen_width // 2, y_start + i * 40))
+
+    def draw_high_scores_screen(self, screen, game):
+        """Draw the high scores screen"""
+        # Title
+        self.text.blit(screen, "HIGH SCORES", 72, COLORS["yellow"], center=(self.screen_width // 2, 100))
+        
+        # High scores
+        y_start = 200
+        
+        leaderboard = game.high_score_manager.leaderboard
+        if leaderboard:
+            # Rows are formatted once by the leaderboard, the Surfaces cached by TextCache
+            for i, display_text in enumerate(leaderboard.rows(VISIBLE_HIGH_SCORES)):
+                self.text.blit(screen, display_text, 48, COLORS["white"], center=(self.screen_width // 2, y_start + i * 60))
+        else:
+            self.text.blit(screen, "No high scores yet!", 48, COLORS["white"], center=(self.screen_width // 2, y_start + 60))
+        
+        # Online leaderboard status
+        client = game.high_score_manager.client
+        if client is not None:
+            if client.top:
+                best = client.top[0]
+                status = f"Online best: {best['name']}: {best['score']:,}"
+            else:
+                status = "Online leaderboard: not synced yet"
+            if client.pending:
+                status += f"  ({len(client.pending)} waiting to upload)"
+            self.text.blit(screen, status, 30, COLORS["magenta"], center=(self.screen_width // 2, 500))
+
+        # Back instruction
+        self.text.blit(screen, "Press H to go back", 36, COLORS["cyan"], center=(self.screen_width // 2, 550))
+
+    def draw_name_input_screen(self, screen, game):
+        """Draw name input screen for high scores"""
+        # Semi-transparent overlay
+        screen.blit(self.overlay, (0, 0))
+        
+        # Title
+        self.text.blit(screen, "NEW HIGH SCORE!", 72, COLORS["yellow"], center=(self.screen_width // 2, self.screen_height // 2 - 100))
+        
+        # Score
+        self.text.blit(screen, f"Score: {game.score:,}", 48, COLORS["white"], center=(self.screen_width // 2, self.screen_height // 2 - 40))
+        
+        # Name input
+        self.text.blit(screen, "Enter your name:", 36, COLORS["cyan"], center=(self.screen_width // 2, self.screen_height // 2 + 20))
+        
+        # Name field
+        name_display = game.player_name + "_" if len(game.player_name) < 15 else game.player_name
+        name_text = self.text.render(name_display, 36, COLORS["white"])
+        name_text_rect = name_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 60))
+        
+        # Name field background
+        field_rect = pygame.Rect(name_text_rect.x - 10, name_text_rect.y - 5, 
+                               max(200, name_text_rect.width + 20), name_text_rect.height + 10)
+        pygame.draw.rect(screen, (40, 40, 60), field_rect)
+        pygame.draw.rect(screen, COLORS["cyan"], field_rect, 2)
+        
+        screen.blit(name_text, name_text_rect)
+        
+        # Instructions
+        self.text.blit(screen, "Press ENTER to save", 36, COLORS["yellow"], center=(self.screen_width // 2, self.screen_height // 2 + 120))
+
+    def draw_next_block_panel(self, screen, game):
+        """Draw an enhanced next block preview panel"""
+        # Panel background and border come from the cached playfield layer
+        panel_x, panel_y, panel_width, panel_height = self.layers.next_panel_rect
+        
+        # Title
+        screen.blit(self.text.render("NEXT BLOCK", 28, COLORS["cyan"]), (panel_x + 10, panel_y + 10))
+        
+        # Draw next block if it exists
+        if game.next_block:
+            # Center the block in the panel
+            shape = game.next_block.get_rotated_shape()
+            block_width = len(shape[0]) * 25
+            block_height = len(shape) * 25
+            
+            block_start_x = panel_x + (panel_width - block_width) // 2
+            block_start_y = panel_y + 50 + (80 - block_height) // 2
+            
+            sprite = game.sprites.get(game.next_block.color, 23)
+            screen.blits(
+                [
+                    (sprite, (block_start_x + x * 25, block_start_y + y * 25))
+                    for x, y in game.next_block.geometry.cells
+                ],
+                doreturn=False,
+            )
+
+        # Smaller previews of the pieces after that
+        for i in range(1, min(4, len(game.generator))):
+            name, color = game.generator.peek(i)
+            geometry = ROTATIONS[name][0]
+            slot_x = panel_x + 10 + (i - 1) * 62
+            slot_y = panel_y + 145
+            start_x = slot_x + (60 - geometry.width * 14) // 2 - geometry.min_x * 14
+            start_y = slot_y + (40 - geometry.height * 14) // 2 - geometry.min_y * 14
+            sprite = game.sprites.get(color, 14)
+            screen.blits(
+                [(sprite, (start_x + x * 14, start_y + y * 14)) for x, y in geometry.cells],
+                doreturn=False,
+            )
+
+    def draw_stats_panel(self, screen, game):
+        """Draw enhanced stats panel"""
+        # Panel background and border come from the cached playfield layer
+        panel_x, panel_y = self.layers.stats_panel_rect.topleft
+        
+        # Stats
+        y_offset = panel_y + 20
+        
+        # Score
+        screen.blit(self.text.render("SCORE", 24, COLORS["yellow"]), (panel_x + 10, y_offset))
+        screen.blit(self.text.render(f"{game.score:,}", 24, COLORS["white"]), (panel_x + 10, y_offset + 25))
+        
+        # High Score
+        high_score = game.high_score_manager.leaderboard.best
+        screen.blit(self.text.render("HIGH SCORE", 24, COLORS["yellow"]), (panel_x + 10, y_offset + 70))
+        screen.blit(self.text.render(f"{high_score:,}", 24, COLORS["white"]), (panel_x + 10, y_offset + 95))
+        
+        # Time
+        if not game.game_over:
+            elapsed_time = game.elapsed_ms() // 1000
+            screen.blit(self.text.render("TIME", 24, COLORS["yellow"]), (panel_x + 10, y_offset + 140))
+            screen.blit(self.text.render(f"{elapsed_time}s", 24, COLORS["white"]), (panel_x + 10, y_offset + 165))
+        
+        # Level
+        screen.blit(self.text.render("LEVEL", 24, COLORS["yellow"]), (panel_x + 10, y_offset + 190))
+        screen.blit(self.text.render(f"{game.level}", 24, COLORS["white"]), (panel_x + 10, y_offset + 215))
+
+    def draw_scene(self, screen):
+        """Draw the current screen"""
+        game = self.game
+        # Static layers are cached; only dynamic content is drawn per frame
+        if game.game_started and not game.show_name_input:
+            screen.blit(self.layers.playfield, (0, 0))
+        else:
+            screen.blit(self.layers.background, (0, 0))
+
+        if not game.game_started:
+            if game.show_high_scores:
+                self.draw_high_scores_screen(screen, game)
+            else:
+                self.draw_start_screen(screen, game)
+        elif game.show_name_input:
+            self.draw_name_input_screen(screen, game)
+        else:
+            # Draw game elements with enhanced graphics
+            game.draw_grid(screen)
+            game.draw_powerups(screen)
+            
+            # Draw particles
+            game.draw_particles(screen)
+            
+            if game.current_block and not game.game_over:
+                game.draw_hint(screen)
+                game.draw_ghost(screen)
+                game.draw_block(screen, game.current_block)
+
+            if game.touch_controls is not None:
+                game.touch_controls.draw(screen)
+
+            # Draw enhanced UI panels
+            self.draw_next_block_panel(screen, game)
+            self.draw_stats_panel(screen, game)
+
+            # Game Over screen with effects
+            if game.game_over:
+                self.draw_game_over(screen, game)
+
+        self.hud.draw(screen)
+
+    def draw_game_over(self, screen, game):
+        """Draw the game over overlay"""
+        # Semi-transparent overlay
+        screen.blit(self.overlay, (0, 0))
+        
+        # Check if it's a high score
+        is_high_score = game.high_score_manager.is_high_score(game.score)
+        
+        # Game over text with glow
+        self.text.blit(screen, "GAME OVER", 84, COLORS["red"], center=(self.screen_width // 2, self.screen_height // 2 - 100))
+        
+        # Final score
+        self.text.blit(screen, f"Final Score: {game.score:,}", 48, COLORS["white"], center=(self.screen_width // 2, self.screen_height // 2 - 40))
+        
+        # High score notification
+        if is_high_score:
+            self.text.blit(screen, "NEW HIGH SCORE!", 36, COLORS["yellow"], center=(self.screen_width // 2, self.screen_height // 2))
+        
+        # Instructions
+        self.text.blit(screen, "Press R to Restart", 36, COLORS["cyan"], center=(self.screen_width // 2, self.screen_height // 2 + 50))
+        self.text.blit(screen, "Press M for Main Menu", 36, COLORS["cyan"], center=(self.screen_width // 2, self.screen_height // 2 + 90))
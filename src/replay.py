@@ -0,0 +1,222 @@
+"""Compact binary replays: a seed plus a varint stream of (frame delta, action).
+
+File layout::
+
+    b"NTR1"  varint seed  byte policy  varint width  varint height
+    event*   varint((frame_delta << 3) | action_code)
+    END      varint(END_CODE)  varint score  varint lines  varint frames
+
+The policy byte holds the piece policy code in its low bits and
+POWERUPS_FLAG when the game had power-ups enabled.
+
+Run ``python src/replay.py FILE...`` to re-simulate replays and check
+their recorded scores.
+"""
+import os
+import sys
+import time
+
+from randomizer import BAG, PURE_RANDOM
+from simulation import (
+    Simulation, MOVE_LEFT, MOVE_RIGHT, SOFT_DROP, ROTATE, GRAVITY, HARD_DROP,
+)
+
+MAGIC = b"NTR1"
+ACTION_CODES = {MOVE_LEFT: 0, MOVE_RIGHT: 1, SOFT_DROP: 2, ROTATE: 3, GRAVITY: 4, HARD_DROP: 5}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+END_CODE = 7
+POLICY_CODES = {PURE_RANDOM: 0, BAG: 1}
+CODE_POLICIES = {code: policy for policy, code in POLICY_CODES.items()}
+POWERUPS_FLAG = 0x10
+
+
+class ReplayError(ValueError):
+    """Raised when replay data is malformed"""
+
+
+def write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """Decode a varint at pos; returns (value, new_pos)"""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class Replay:
+    def __init__(self, seed, policy=PURE_RANDOM, width=10, height=20,
+                 events=None, score=0, lines=0, frames=0, powerups=False):
+        self.seed = seed
+        self.policy = policy
+        self.powerups = powerups
+        self.width = width
+        self.height = height
+        self.events = events if events is not None else []  # (frame, action)
+        self.score = score
+        self.lines = lines
+        self.frames = frames
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        write_varint(out, self.seed)
+        out.append(POLICY_CODES[self.policy] | (POWERUPS_FLAG if self.powerups else 0))
+        write_varint(out, self.width)
+        write_varint(out, self.height)
+        last_frame = 0
+        for frame, action in self.events:
+            write_varint(out, ((frame - last_frame) << 3) | ACTION_CODES[action])
+            last_frame = frame
+        write_varint(out, END_CODE)
+        write_varint(out, self.score)
+        write_varint(out, self.lines)
+        write_varint(out, self.frames)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ReplayError("Not a replay file")
+        pos = len(MAGIC)
+        seed, pos = read_varint(data, pos)
+        if pos >= len(data) or data[pos] & ~POWERUPS_FLAG not in CODE_POLICIES:
+            raise ReplayError("Unknown piece policy")
+        policy = CODE_POLICIES[data[pos] & ~POWERUPS_FLAG]
+        powerups = bool(data[pos] & POWERUPS_FLAG)
+        width, pos = read_varint(data, pos + 1)
+        height, pos = read_varint(data, pos)
+
+        events = []
+        frame = 0
+        while True:
+            value, pos = read_varint(data, pos)
+            code = value & 0x7
+            if code == END_CODE:
+                break
+            if code not in CODE_ACTIONS:
+                raise ReplayError(f"Unknown action code {code}")
+            frame += value >> 3
+            events.append((frame, CODE_ACTIONS[code]))
+        score, pos = read_varint(data, pos)
+        lines, pos = read_varint(data, pos)
+        frames, pos = read_varint(data, pos)
+        return cls(seed, policy, width, height, events, score, lines, frames, powerups)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Attach to a Simulation to capture every effective action it applies"""
+
+    def __init__(self, sim):
+        self.replay = Replay(sim.seed, sim.policy, sim.width, sim.height, powerups=sim.powerups_enabled)
+        sim.recorder = self
+
+    def record(self, frame, action):
+        self.replay.events.append((frame, action))
+
+    def finish(self, sim):
+        """Detach and stamp the final result; returns the Replay"""
+        sim.recorder = None
+        self.replay.score = sim.score
+        self.replay.lines = sim.lines_cleared_total
+        self.replay.frames = sim.frame
+        return self.replay
+
+
+def new_simulation(replay):
+    sim = Simulation(replay.width, replay.height, seed=replay.seed, policy=replay.policy,
+                     powerups=replay.powerups)
+    sim.auto_gravity = False  # Gravity comes from the recorded stream
+    return sim
+
+
+class ReplayPlayer:
+    """Plays a replay back one frame at a time, for watching at normal speed"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.sim = new_simulation(replay)
+        self.index = 0
+
+    @property
+    def finished(self):
+        return self.index >= len(self.replay.events)
+
+    def step(self):
+        """Advance one frame, applying the events recorded for it"""
+        sim = self.sim
+        events = self.replay.events
+        while self.index < len(events) and events[self.index][0] <= sim.frame:
+            sim.apply(events[self.index][1])
+            self.index += 1
+        sim.step()
+        return sim
+
+
+def fast_forward(replay):
+    """Re-simulate a whole replay without rendering; returns the final Simulation"""
+    sim = new_simulation(replay)
+    apply = sim.apply
+    for frame, action in replay.events:
+        sim.frame = frame
+        apply(action)
+        sim.events.clear()
+    sim.frame = replay.frames
+    return sim
+
+
+def validate(replay):
+    """True when re-simulating the replay reproduces its recorded score and lines"""
+    sim = fast_forward(replay)
+    return sim.score == replay.score and sim.lines_cleared_total == replay.lines
+
+
+def save_replay(replay, directory="replays"):
+    """Write a replay under directory and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{int(time.time() * 1000)}_{replay.score}.ntr")
+    replay.save(path)
+    return path
+
+
+def main(paths):
+    failures = 0
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            ok = validate(Replay.load(path))
+        except (OSError, ReplayError) as error:
+            print(f"{path}: {error}")
+            failures += 1
+            continue
+        if not ok:
+            failures += 1
+        print(f"{path}: {'ok' if ok else 'MISMATCH'}")
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} replays in {elapsed:.3f}s, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
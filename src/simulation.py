@@ -0,0 +1,312 @@
+import heapq
+import random
+
+from board import Board
+from pieces import KICKS, DEFAULT_KICKS, Block
+from randomizer import PieceGenerator, PURE_RANDOM
+from powerups import PowerUpManager, EFFECT_TICKS
+
+# Nominal frame length used when a headless run steps frame by frame
+FRAME_MS = 1000 / 60
+
+# Line clears within this many milliseconds of each other build a combo
+COMBO_WINDOW_MS = 3000
+
+# Actions understood by Simulation.apply
+MOVE_LEFT = "left"
+MOVE_RIGHT = "right"
+SOFT_DROP = "down"
+ROTATE = "rotate"
+GRAVITY = "gravity"
+HARD_DROP = "hard_drop"
+
+
+def gravity_interval(level):
+    """Milliseconds between gravity steps at a given level"""
+    if level <= 1:
+        return 500
+    return max(50, 500 - (level * 30))  # Faster drops
+
+
+def clear_score(lines, level, combo):
+    """Points for clearing lines at a level with the current combo count"""
+    base_score = lines * 100 * level
+    combo_bonus = combo * 50
+    return base_score + combo_bonus
+
+
+class Simulation:
+    """Pygame-free rules engine: spawn, move, rotate, gravity, lock, clear, scoring.
+
+    ``clock`` is any callable returning milliseconds. By default time is
+    derived from the frame counter that ``step`` advances, which keeps
+    runs reproducible. Pieces come from a PieceGenerator seeded with
+    ``seed`` (a fresh random seed when None), so a seed reproduces a whole
+    game. Effective actions are passed to ``recorder.record(frame, action)``
+    when a recorder is attached.
+    Things the renderer may care about are appended to ``events`` as
+    tuples, for example ``("clear", rows, row_colors)``; the owner drains
+    the list after each call.
+
+    With ``powerups`` enabled, line clears may drop power-ups that a
+    locked piece collects. Timed effects are callbacks on a tick
+    scheduler (a heap keyed by frame) that runs before each step and
+    action, so a replay that only jumps between recorded frames still
+    sees them in the same order.
+    """
+
+    def __init__(self, width=10, height=20, clock=None, seed=None, policy=PURE_RANDOM, preview=4,
+                 powerups=False):
+        self.width = width
+        self.height = height
+        self.clock = clock or self.frame_time
+        self.policy = policy
+        self.preview = preview
+        self.powerups_enabled = powerups
+        self.board = Board(width, height)
+        self.events = []
+        self.recorder = None
+        self.auto_gravity = True
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new game, from a fresh random seed unless one is given"""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.frame = 0
+        self.generator = PieceGenerator(seed, self.policy, self.preview)
+        self.rng = random.Random(seed ^ 0x5EED)  # Power-ups; separate from the piece stream
+        self.scheduled = []  # (frame, seq, callback, args)
+        self.schedule_seq = 0
+        self.powerups = PowerUpManager(self.width, self.height, self.rng)
+        self.gravity_scale = 1  # Multiplies game_tick while slow_time is active
+        self.slow_effects = 0
+        self.ghost_effects = 0
+        self.board.reset()
+        self.current_block = None
+        self.next_block = None
+        self.score = 0
+        self.level = 1
+        self.lines_cleared_total = 0
+        self.combo_count = 0
+        self.last_clear_time = 0
+        self.game_tick = gravity_interval(self.level)
+        self.topped_out = False
+        now = self.clock()
+        self.last_fall_time = now
+        self.start_time = now
+        self.events.clear()
+        self.spawn_block()
+
+    def schedule(self, delay, callback, *args):
+        """Run callback(*args) once the frame counter reaches frame + delay"""
+        heapq.heappush(self.scheduled, (self.frame + delay, self.schedule_seq, callback, args))
+        self.schedule_seq += 1
+
+    def run_scheduled(self):
+        """Run due callbacks and expire power-ups up to the current frame"""
+        scheduled = self.scheduled
+        while scheduled and scheduled[0][0] <= self.frame:
+            _, _, callback, args = heapq.heappop(scheduled)
+            callback(*args)
+        if self.powerups:
+            self.powerups.expire(self.frame)
+
+    def frame_time(self):
+        """Default clock: milliseconds of game time at the current frame"""
+        return self.frame * FRAME_MS
+
+    def elapsed_ms(self):
+        return self.clock() - self.start_time
+
+    def generate_next_block(self):
+        """Build the preview Block from the head of the piece queue"""
+        self.next_block = Block(*self.generator.peek())
+
+    def spawn_block(self):
+        """Spawn the next block as current block"""
+        if self.next_block is None:
+            self.generate_next_block()
+
+        self.current_block = self.next_block
+        self.current_block.x = self.width // 2 - 1
+        self.current_block.y = 0
+        self.generator.next()
+
+        # Generate new next block
+        self.generate_next_block()
+
+        # Check for game over
+        if self.check_collision(self.current_block):
+            self.topped_out = True
+            self.events.append(("top_out",))
+
+    def check_collision(self, block):
+        return self.board.collides(block.geometry.row_masks, block.x, block.y)
+
+    def landing_y(self, block=None):
+        """Row the block would land on if dropped straight down"""
+        block = block or self.current_block
+        geometry = block.geometry
+        distance = self.board.drop_distance(geometry.bottoms, block.x, block.y)
+        if distance is not None:
+            return block.y + distance
+        # Under an overhang the column heights don't apply; probe instead
+        y = block.y
+        while not self.board.collides(geometry.row_masks, block.x, y + 1):
+            y += 1
+        return y
+
+    def move_block(self, dx, dy):
+        block = self.current_block
+        block.x += dx
+        block.y += dy
+        if self.check_collision(block):
+            block.x -= dx
+            block.y -= dy
+            return False
+        return True
+
+    def rotate_block(self):
+        block = self.current_block
+        original_rotation = block.rotation
+        original_x, original_y = block.x, block.y
+        block.rotation = (block.rotation + 1) % 4
+        # Try each wall kick until one fits
+        for dx, dy in KICKS.get(block.name, DEFAULT_KICKS):
+            block.x = original_x + dx
+            block.y = original_y + dy
+            if not self.check_collision(block):
+                return True
+        block.rotation = original_rotation
+        block.x, block.y = original_x, original_y
+        return False
+
+    def lock_block(self):
+        block = self.current_block
+        self.board.place(block.geometry.row_masks, block.x, block.y, block.color)
+        self.events.append(("lock", block))
+        if self.powerups:
+            for power_up in self.powerups.check_collection(block.geometry.row_masks, block.x, block.y):
+                self.activate_powerup(power_up)
+
+    def activate_powerup(self, power_up):
+        self.events.append(("powerup", power_up))
+        if power_up.type == "clear_line":
+            # Clear the lowest row that has anything in it
+            for y in range(self.height - 1, -1, -1):
+                if self.board.rows[y]:
+                    row_colors = [list(self.board.colors[y])]
+                    self.board.clear_rows([y])
+                    self.powerups.clear_rows([y])
+                    self.events.append(("clear", [y], row_colors))
+                    break
+        elif power_up.type == "slow_time":
+            self.slow_effects += 1
+            self.gravity_scale = 2
+            self.schedule(EFFECT_TICKS, self.end_slow_time)
+        elif power_up.type == "ghost_block":
+            self.ghost_effects += 1
+            self.schedule(EFFECT_TICKS, self.end_ghost_block)
+
+    def end_slow_time(self):
+        self.slow_effects -= 1
+        if not self.slow_effects:
+            self.gravity_scale = 1
+
+    def end_ghost_block(self):
+        self.ghost_effects -= 1
+
+    def clear_lines(self):
+        full_rows = self.board.full_rows()
+        lines_cleared = len(full_rows)
+        if not lines_cleared:
+            return 0
+
+        # Combo system
+        current_time = self.clock()
+        if current_time - self.last_clear_time < COMBO_WINDOW_MS:
+            self.combo_count += 1
+        else:
+            self.combo_count = 1
+        self.last_clear_time = current_time
+
+        # Enhanced scoring with combos
+        self.score += clear_score(lines_cleared, self.level, self.combo_count)
+
+        # Level progression
+        self.lines_cleared_total += lines_cleared
+        new_level = (self.lines_cleared_total // 10) + 1
+        if new_level > self.level:
+            self.level = new_level
+            self.game_tick = gravity_interval(self.level)
+            self.events.append(("level_up", self.level))
+
+        row_colors = [list(self.board.colors[y]) for y in full_rows]
+        self.board.clear_rows(full_rows)
+        self.events.append(("clear", full_rows, row_colors))
+        if self.powerups_enabled:
+            self.powerups.clear_rows(full_rows)
+            # Cleared row indices now hold the rows that fell into them
+            self.powerups.maybe_spawn_powerup(full_rows, self.board, self.frame)
+        return lines_cleared
+
+    def gravity_step(self):
+        """Move the block down one row, locking it and spawning the next on landing"""
+        if self.move_block(0, 1):
+            return False
+        self.land_block()
+        return True
+
+    def hard_drop(self):
+        """Drop the block straight to its landing row and lock it there"""
+        block = self.current_block
+        block.y = self.landing_y(block)
+        self.land_block()
+        self.last_fall_time = self.clock()  # The next block gets a full gravity interval
+
+    def land_block(self):
+        self.lock_block()
+        self.clear_lines()
+        self.spawn_block()
+
+    def apply(self, action):
+        """Apply one input or gravity action; returns whether it changed anything"""
+        if self.topped_out:
+            return False
+        self.run_scheduled()
+        if action == MOVE_LEFT:
+            changed = self.move_block(-1, 0)
+        elif action == MOVE_RIGHT:
+            changed = self.move_block(1, 0)
+        elif action == SOFT_DROP:
+            changed = self.move_block(0, 1)
+        elif action == ROTATE:
+            changed = self.rotate_block()
+        elif action == GRAVITY:
+            self.gravity_step()
+            changed = True
+        elif action == HARD_DROP:
+            self.hard_drop()
+            changed = True
+        else:
+            raise ValueError(f"Unknown action: {action!r}")
+        if changed and self.recorder is not None:
+            self.recorder.record(self.frame, action)
+        return changed
+
+    def update(self):
+        """Apply gravity if the fall interval has elapsed on the clock"""
+        if self.topped_out or not self.auto_gravity:
+            return
+        current_time = self.clock()
+        if current_time - self.last_fall_time > self.game_tick * self.gravity_scale:
+            self.apply(GRAVITY)
+            self.last_fall_time = current_time
+
+    def step(self):
+        """Advance one frame, run due scheduled effects and update"""
+        self.frame += 1
+        self.run_scheduled()
+        self.update()
@@ -0,0 +1,73 @@
+import pygame
+
+
+def render_cell(color, size, highlight=True):
+    """Render one block cell: fill, optional inner highlight and white border"""
+    surface = pygame.Surface((size, size))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    rect = surface.get_rect()
+    surface.fill(color)
+    if highlight:
+        # Inner highlight for 3D effect
+        highlight_rect = pygame.Rect(2, 2, size - 4, size - 4)
+        highlight_color = tuple(min(255, c + 80) for c in color)
+        pygame.draw.rect(surface, highlight_color, highlight_rect, 2)
+    # Outer border
+    pygame.draw.rect(surface, (255, 255, 255), rect, 1)
+    return surface
+
+
+def render_outline(color, size, width=1, inset=0, fill=None):
+    """Render a transparent cell with a rectangle outline, optionally filled.
+
+    Blitting these instead of calling pygame.draw.rect on the screen keeps
+    outlines correct under a clip rect: draw.rect clips the rectangle first
+    and then strokes the clipped edges.
+    """
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    rect = surface.get_rect().inflate(-2 * inset, -2 * inset)
+    if fill is not None:
+        pygame.draw.rect(surface, fill, rect)
+    pygame.draw.rect(surface, color, rect, width)
+    return surface
+
+
+class CellSpriteAtlas:
+    """Pre-rendered cell Surfaces keyed by (color, size, highlight).
+
+    Every palette color is rendered up front for the given sizes; colors
+    that show up later (for example from a theme) are rendered on first use.
+    """
+
+    def __init__(self, colors=(), sizes=()):
+        self.sprites = {}
+        self.add_colors(colors, sizes)
+
+    def add_colors(self, colors, sizes):
+        """Pre-render a palette at the given cell sizes, e.g. when a theme loads"""
+        for color in colors:
+            for size in sizes:
+                for highlight in (True, False):
+                    self.get(color, size, highlight)
+
+    def get(self, color, size, highlight=True):
+        key = (color, size, highlight)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = render_cell(color, size, highlight)
+            self.sprites[key] = sprite
+        return sprite
+
+    def outline(self, color, size, width=1, inset=0, fill=None):
+        """Cached render_outline Surface"""
+        key = ("outline", color, size, width, inset, fill)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = render_outline(color, size, width, inset, fill)
+            self.sprites[key] = sprite
+        return sprite
+
+    def clear(self):
+        """Drop all sprites, e.g. after the display format changes"""
+        self.sprites.clear()
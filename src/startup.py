@@ -0,0 +1,62 @@
+"""Startup timing: imports, each init stage and background loads up to the first frame.
+
+Import ``startup`` before anything else in main.py so module imports are
+part of the report.
+"""
+import time
+
+# Time from launch to the first presented frame we aim for
+FIRST_FRAME_BUDGET_MS = 500
+
+
+class StartupTimer:
+    """Named startup phases, timed from when this module was imported.
+
+    ``mark(name)`` closes a phase that began at the previous mark.
+    ``track(name, awaitable)`` times a background task that overlaps the
+    first frames, for example loading sounds while the start screen shows.
+    """
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = []  # (name, duration ms, finished at ms)
+        self.first_frame_ms = None
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000, (now - self.start) * 1000))
+        self.last = now
+
+    def first_frame(self):
+        """Call when a frame has been presented; only the first one counts"""
+        if self.first_frame_ms is None:
+            self.mark("first frame")
+            self.first_frame_ms = self.phases[-1][2]
+
+    @property
+    def over_budget(self):
+        return self.first_frame_ms is not None and self.first_frame_ms > FIRST_FRAME_BUDGET_MS
+
+    async def track(self, name, awaitable):
+        """Await a background load, recording how long it took and when it finished"""
+        began = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            now = time.perf_counter()
+            self.phases.append((name + " (background)", (now - began) * 1000, (now - self.start) * 1000))
+
+    def report(self):
+        lines = ["Startup:"]
+        for name, duration, at in self.phases:
+            lines.append(f"  {name:<32}{duration:8.1f} ms   at {at:8.1f} ms")
+        if self.first_frame_ms is not None:
+            verdict = "over" if self.over_budget else "within"
+            lines.append(f"  First frame {verdict} the {FIRST_FRAME_BUDGET_MS} ms budget")
+        return "\n".join(lines)
+
+
+startup = StartupTimer()
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Font registry plus an LRU cache of rendered text Surfaces.
+
+    Fonts are created once per size. Rendered Surfaces are keyed by
+    (text, size, color) and evicted least-recently-used first once their
+    combined pixel memory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, font_name=None, max_bytes=4 * 1024 * 1024):
+        self.font_name = font_name
+        self.max_bytes = max_bytes
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.used_bytes = 0
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.font_name, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color):
+        """Rendered Surface for text, reusing a cached one when possible"""
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        self.used_bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.used_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.used_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+        return surface
+
+    def blit(self, screen, text, size, color, **rect_kwargs):
+        """Render text and blit it positioned by get_rect keyword arguments"""
+        surface = self.render(text, size, color)
+        rect = surface.get_rect(**rect_kwargs)
+        screen.blit(surface, rect)
+        return rect
+
+    def clear(self):
+        self.surfaces.clear()
+        self.used_bytes = 0
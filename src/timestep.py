@@ -0,0 +1,48 @@
+from simulation import FRAME_MS
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into whole simulation ticks.
+
+    ``advance(dt_ms)`` banks real time and returns how many ``tick_ms``
+    ticks to run this frame, at most ``max_ticks`` so one slow frame can't
+    stall the next. Time still owed carries over, and anything beyond
+    ``max_backlog_ms`` is dropped so the game never spirals after a long
+    stall (a background tab, say). While a backlog remains, ``render`` is
+    False for up to ``max_frame_skip`` frames in a row so the CPU goes to
+    catching up. ``alpha`` is how far the clock is between the last tick
+    and the next, for interpolated drawing.
+    """
+
+    def __init__(self, tick_ms=FRAME_MS, max_ticks=5, max_backlog_ms=250, max_frame_skip=2):
+        self.tick_ms = tick_ms
+        self.max_ticks = max_ticks
+        self.max_backlog_ms = max_backlog_ms
+        self.max_frame_skip = max_frame_skip
+        self.reset()
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.render = True
+        self.skipped = 0
+        self.dropped_ms = 0.0
+
+    def advance(self, dt_ms):
+        """Bank dt_ms of real time; returns the number of ticks to run now"""
+        self.accumulator += dt_ms
+        if self.accumulator > self.max_backlog_ms:
+            self.dropped_ms += self.accumulator - self.max_backlog_ms
+            self.accumulator = self.max_backlog_ms
+        ticks = min(self.max_ticks, int(self.accumulator // self.tick_ms))
+        self.accumulator -= ticks * self.tick_ms
+
+        behind = self.accumulator >= self.tick_ms
+        if behind and self.skipped < self.max_frame_skip:
+            self.render = False
+            self.skipped += 1
+        else:
+            self.render = True
+            self.skipped = 0
+        self.alpha = min(1.0, self.accumulator / self.tick_ms)
+        return ticks